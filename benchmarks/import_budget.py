@@ -0,0 +1,81 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Import-time budget check. Each module is imported in fresh interpreters (scripted jobs pay this
+# on every process start); the check fails when the median import time exceeds the budget or when
+# a heavy dependency the module is meant to defer gets loaded.
+#
+#   python benchmarks/import_budget.py [--json]
+
+ROOT = Path(__file__).resolve().parents[1]
+
+GUI_STACK = ("tkinter", "customtkinter", "matplotlib")
+
+BUDGETS = {
+    # module: (budget [s], modules that must not be loaded by the import)
+    "simulation.brayton_cycle": (0.05, ("numpy",) + GUI_STACK),
+    "simulation.cache": (0.05, ("numpy",) + GUI_STACK),
+    "simulation.cycle_kernel": (0.5, GUI_STACK),
+    "simulation.cli": (0.5, GUI_STACK),
+    "gui.app": (1.0, ("numpy", "matplotlib")),
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(sorted(name for name in sys.modules if "." not in name)))
+"""
+
+def measure_times(module, repeats=5):
+    # Import time of every fresh interpreter, and the top-level modules any of them loaded
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    times = []
+    loaded = set()
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module)],
+                                cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        elapsed, modules = output.strip().splitlines()
+        times.append(float(elapsed))
+        loaded.update(modules.split(","))
+    return times, loaded
+
+def measure(module, repeats=5):
+    times, loaded = measure_times(module, repeats)
+    return statistics.median(times), loaded
+
+def check(budgets=BUDGETS, repeats=5):
+    report = []
+    for module, (budget, forbidden) in budgets.items():
+        seconds, loaded = measure(module, repeats)
+        unexpected = sorted(name for name in forbidden if name in loaded)
+        report.append({
+            "module": module,
+            "seconds": seconds,
+            "budget": budget,
+            "unexpected_imports": unexpected,
+            "passed": seconds <= budget and not unexpected
+        })
+    return report
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    report = check()
+    if "--json" in argv:
+        print(json.dumps(report, indent=2))
+    else:
+        for entry in report:
+            status = "ok" if entry["passed"] else "FAIL"
+            extra = f"  loads {', '.join(entry['unexpected_imports'])}" if entry["unexpected_imports"] else ""
+            print(f"{status:4} {entry['module']:28} {entry['seconds'] * 1000:8.1f} ms "
+                  f"(budget {entry['budget'] * 1000:.0f} ms){extra}")
+    return 0 if all(entry["passed"] for entry in report) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
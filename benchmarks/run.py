@@ -0,0 +1,373 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from benchmarks import import_budget
+from gui.model import simulate
+from gui.plotting import PLOT_TEMPLATES
+from simulation.batch import BraytonCycleBatch
+from simulation.brayton_cycle import BraytonCycle
+from simulation.cache import CycleCache
+from simulation.cycle_variants import Compression, CycleVariant, Expansion, Recuperator
+from simulation.design_map import DesignMap
+from simulation.sensitivity import cycle_jacobian
+from simulation.sweep import DesignSpace, sweep
+from simulation.turbofan import Turbofan
+
+# Benchmark suite for the hot paths. Results are written as JSON and compared against the stored
+# baseline on the best (minimum) time of the repeats, which background load can only raise.
+# A fixed reference workload is timed next to every repeat, and each best time is scaled to the
+# fastest reference of the run, so a slow phase of the machine is not read as a slow benchmark.
+# A benchmark counts as a regression when it is slower than baseline × (1 + tolerance + noise),
+# where noise is the larger relative spread (median vs best) of its samples in this run and in the
+# baseline, and by more than MIN_DELTA. Suspected regressions are timed again (--confirm times)
+# before the run fails, so a burst of load on an unchanged tree does not fail it.
+#
+#   python benchmarks/run.py                      # run and compare with benchmarks/baseline.json
+#   python benchmarks/run.py --output out.json    # also write this run's results
+#   python benchmarks/run.py --update-baseline    # store this run as the new baseline
+#                                                 # (only for new benchmarks or intended changes,
+#                                                 # never to absorb a slowdown)
+#   python benchmarks/run.py -k plot              # only benchmarks whose name contains "plot"
+
+BASELINE = ROOT / "benchmarks" / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEATS = 10
+DEFAULT_CONFIRM = 2
+MIN_DELTA = 0.001  # slowdowns below 1 ms are timer/process-start noise, never a regression
+
+PRESET = {"T1": 288, "P1": 101325, "rp": 10, "Tmax": 1600, "eta_c": 0.85, "eta_t": 0.88}
+PLOT_TYPES = ("P vs T", "T vs s", "P vs v", "Efficiency vs Pressure Ratio", "Net Work vs Pressure Ratio")
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    # Registers a setup function returning the zero-argument callable to time
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+@benchmark("cycle.single_point")
+def single_point():
+    def run():
+        cycle = BraytonCycle(288, 101325, 10, 1600, eta_c=0.85, eta_t=0.88)
+        cycle.run()
+        return cycle.get_results()
+    return run
+
+@benchmark("cycle.tmax_step")
+def tmax_step():
+    # One slider step on an evaluated cycle: only the T_max-dependent quantities are recomputed
+    cycle = BraytonCycle(288, 101325, 10, 1600, eta_c=0.85, eta_t=0.88)
+    cycle.run()
+    state = {"step": 0}
+
+    def run():
+        state["step"] += 1
+        cycle.T_max = 1200 + state["step"] % 800
+        return cycle.get_results()
+    return run
+
+@benchmark("batch.1M_points")
+def batch_points():
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    cycle = BraytonCycleBatch(rng.uniform(250, 320, n), 101325, rng.uniform(2, 40, n), rng.uniform(1200, 2000, n),
+                              eta_c=rng.uniform(0.8, 0.9, n), eta_t=rng.uniform(0.8, 0.9, n))
+    return cycle.run
+
+@benchmark("sensitivity.1M_points")
+def sensitivity_points():
+    # Primal evaluation plus all 35 derivatives; compare with batch.1M_points
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    inputs = (rng.uniform(250, 320, n), 101325, rng.uniform(2, 40, n), rng.uniform(1200, 2000, n),
+              rng.uniform(0.8, 0.9, n), rng.uniform(0.8, 0.9, n))
+    return lambda: cycle_jacobian(*inputs)
+
+@benchmark("turbofan.1M_points")
+def turbofan_points():
+    # A batch of two-spool turbofans at cruise; compare with batch.1M_points (simple cycle)
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    engine = Turbofan(rng.uniform(0, 10, n), rng.uniform(1.3, 1.8, n), 1.5, rng.uniform(5, 20, n),
+                      rng.uniform(1300, 1900, n))
+    mach = rng.uniform(0, 0.9, n)
+    return lambda: engine.run(216.65, 22632, mach)
+
+@benchmark("variants.1M_points")
+def variant_points():
+    # Two-stage intercooled, two-stage reheat, recuperated cycle; compare with batch.1M_points
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    variant = CycleVariant(Compression(stages=2), Expansion(stages=2), Recuperator(0.85))
+    inputs = (rng.uniform(250, 320, n), 101325, rng.uniform(2, 40, n), rng.uniform(1200, 2000, n),
+              rng.uniform(0.8, 0.9, n), rng.uniform(0.85, 0.95, n))
+    return lambda: variant.run(*inputs)
+
+@benchmark("sweep.2M_points")
+def sweep_points():
+    space = DesignSpace(np.linspace(250, 320, 8), [101325, 50000], np.linspace(2, 40, 50),
+                        np.linspace(1200, 2000, 50), np.linspace(0.8, 0.9, 5), np.linspace(0.8, 0.9, 10))
+
+    def run():
+        for _ in sweep(space):
+            pass
+    return run
+
+def _plot_data(plot_type):
+    return simulate(PRESET, plot_type, CycleCache())["plot_data"]
+
+for _plot_type in PLOT_TEMPLATES:
+    def _figure_render(plot_type=_plot_type):
+        # New template + full Agg render, i.e. the cost of showing a plot type for the first time
+        data = _plot_data(plot_type)
+
+        def run():
+            template = PLOT_TEMPLATES[plot_type]()
+            template.update(*data)
+            FigureCanvasAgg(template.figure).draw()
+        return run
+
+    def _figure_update(plot_type=_plot_type):
+        # In-place update of an existing figure + Agg render, i.e. the cost of a slider step
+        data = _plot_data(plot_type)
+        template = PLOT_TEMPLATES[plot_type]()
+        canvas = FigureCanvasAgg(template.figure)
+
+        def run():
+            template.update(*data)
+            canvas.draw()
+        return run
+
+    benchmark(f"plot.render.{_plot_type}")(_figure_render)
+    benchmark(f"plot.update.{_plot_type}")(_figure_update)
+
+def _heatmap_frames(coarse):
+    # One zoom/pan frame on a precomputed 4096² map: the view at the current level of detail plus
+    # an Agg render, cycling through a few zoom levels
+    design_map = DesignMap("eta_actual", PRESET["T1"], eta_c=PRESET["eta_c"], eta_t=PRESET["eta_t"],
+                           resolution=(4096, 4096))
+    template = PLOT_TEMPLATES["Efficiency Map (rp × Tmax)"]()
+    template.update(design_map)
+    canvas = FigureCanvasAgg(template.figure)
+    views = [((1.5, 40), (1200, 2000)), ((5, 25), (1300, 1900)), ((8, 12), (1500, 1700)), ((9.9, 10.1), (1590, 1610))]
+    state = {"step": 0}
+
+    def run():
+        state["step"] += 1
+        rp_limits, Tmax_limits = views[state["step"] % len(views)]
+        template.ax.set_xlim(rp_limits)
+        template.ax.set_ylim(Tmax_limits)
+        template.render(coarse=coarse)
+        canvas.draw()
+    return run
+
+benchmark("heatmap.4096.coarse_frame")(lambda: _heatmap_frames(True))
+benchmark("heatmap.4096.refined_frame")(lambda: _heatmap_frames(False))
+
+@benchmark("heatmap.slider_step.worker")
+def heatmap_step_worker():
+    # The worker's share of a slider step on a heatmap: the map's grid and pyramid (plot_data)
+    state = {"step": 0}
+
+    def run():
+        state["step"] += 1
+        return simulate(dict(PRESET, rp=2 + state["step"] % 380 / 10), "Efficiency Map (rp × Tmax)",
+                        CycleCache())["plot_data"]
+    return run
+
+@benchmark("heatmap.slider_step.tk")
+def heatmap_step_tk():
+    # The Tk thread's share of a slider step on a connected heatmap, before drawing: a frame strided
+    # from the grid and its contour lines (the exact refinement runs on the worker)
+    design_map, = simulate(PRESET, "Efficiency Map (rp × Tmax)", CycleCache())["plot_data"]
+    template = PLOT_TEMPLATES["Efficiency Map (rp × Tmax)"]()
+    template.update(design_map)
+    FigureCanvasAgg(template.figure)
+
+    def run():
+        template._draw(*design_map.view(template.ax.get_xlim(), template.ax.get_ylim(), template._pixels(), True))
+    return run
+
+@benchmark("plot.slider_step.tk")
+def plot_step_tk():
+    # The Tk thread's share of a slider step on a cycle plot: setting the artist data and limits
+    # (the Agg render runs on the worker; Tk then copies the image, which needs a display to time)
+    data = [simulate(dict(PRESET, rp=2 + step / 10), "P vs T", CycleCache())["plot_data"] for step in range(100)]
+    template = PLOT_TEMPLATES["P vs T"]()
+    FigureCanvasAgg(template.figure)
+    state = {"step": 0}
+
+    def run():
+        state["step"] += 1
+        template.update(*data[state["step"] % len(data)])
+    return run
+
+@benchmark("run_simulation.end_to_end")
+def end_to_end():
+    # What run_simulation does per event minus Tk: simulate (uncached operating point),
+    # update the persistent figure and render it with Agg
+    templates = {plot_type: PLOT_TEMPLATES[plot_type]() for plot_type in PLOT_TYPES}
+    canvases = {plot_type: FigureCanvasAgg(template.figure) for plot_type, template in templates.items()}
+    state = {"step": 0}
+
+    def run():
+        state["step"] += 1
+        inputs = dict(PRESET, rp=2 + state["step"] % 380 / 10)
+        plot_type = PLOT_TYPES[state["step"] % len(PLOT_TYPES)]
+        output = simulate(inputs, plot_type, CycleCache())
+        templates[plot_type].update(*output["plot_data"])
+        canvases[plot_type].draw()
+    return run
+
+def _reference_workload():
+    return sum(i * i for i in range(20000))
+
+def time_reference():
+    # A fixed pure-Python workload timed next to every benchmark; it tracks how fast the machine runs
+    # at that moment, which on shared hosts drifts by far more than the tolerance
+    return min(timeit.repeat(_reference_workload, repeat=3, number=1))
+
+def _summary(samples, number, references):
+    best = min(samples)
+    median = statistics.median(samples)
+    return {"seconds": median, "best": best, "spread": (median - best) / best, "number": number,
+            "repeats": len(samples), "reference": min(references)}
+
+def time_benchmark(setup, repeats=DEFAULT_REPEATS):
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    samples, references = [], []
+    for _ in range(repeats):
+        references.append(time_reference())
+        samples.append(timer.timeit(number) / number)
+    return _summary(samples, number, references)
+
+def time_import(module, repeats=DEFAULT_REPEATS):
+    references = [time_reference()]
+    samples = import_budget.measure_times(module, repeats)[0]
+    references.append(time_reference())
+    return _summary(samples, 1, references)
+
+def time_by_name(name, repeats=DEFAULT_REPEATS):
+    if name.startswith("import."):
+        return time_import(name[len("import."):], repeats)
+    return time_benchmark(BENCHMARKS[name], repeats)
+
+def adjust(results):
+    # Scales each best time to the fastest the machine ran during this run (the quickest reference
+    # time): a benchmark that happened to run through a slow phase is not mistaken for a regression,
+    # while a slowdown of the code itself leaves the reference untouched and still shows
+    fastest = min(result["reference"] for result in results.values())
+    for result in results.values():
+        result["adjusted"] = result["best"] * fastest / result["reference"]
+    return results
+
+def run_benchmarks(selection=None, repeats=DEFAULT_REPEATS, include_imports=True):
+    names = [name for name in BENCHMARKS if not selection or selection in name]
+    if include_imports:
+        names += [f"import.{module}" for module in import_budget.BUDGETS
+                  if not selection or selection in f"import.{module}"]
+    results = {}
+    for name in names:
+        results[name] = time_by_name(name, repeats)
+        print(f"{name:45} {results[name]['best'] * 1000:10.3f} ms", file=sys.stderr)
+    return adjust(results)
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    # Benchmarks missing from the baseline are reported but never fail the run
+    comparison = {}
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            comparison[name] = {"status": "new", "ratio": None}
+            continue
+        best, reference_best = result["adjusted"], reference.get("adjusted", reference["best"])
+        ratio = best / reference_best
+        noise = max(result.get("spread", 0.0), reference.get("spread", 0.0))
+        slower = ratio > 1 + tolerance + noise and best - reference_best > MIN_DELTA
+        comparison[name] = {"status": "regression" if slower else "ok", "ratio": ratio}
+    return comparison
+
+def confirm(results, baseline, tolerance=DEFAULT_TOLERANCE, repeats=DEFAULT_REPEATS, attempts=DEFAULT_CONFIRM):
+    # Times suspected regressions again, keeping the better run of each, until they pass or the
+    # attempts run out. A real slowdown persists; load on the machine rarely does.
+    comparison = compare(results, baseline, tolerance)
+    for _ in range(attempts):
+        suspects = [name for name, entry in comparison.items() if entry["status"] == "regression"]
+        if not suspects:
+            break
+        for name in suspects:
+            retry = time_by_name(name, repeats)
+            print(f"{'retimed':10} {name:45} {retry['best'] * 1000:10.3f} ms", file=sys.stderr)
+            if retry["best"] / retry["reference"] < results[name]["best"] / results[name]["reference"]:
+                results[name] = retry
+        comparison = compare(adjust(results), baseline, tolerance)
+    return comparison
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system()
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare against the baseline.")
+    parser.add_argument("-k", dest="selection", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="Write this run's results as JSON")
+    parser.add_argument("--baseline", default=str(BASELINE), help="Baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--confirm", type=int, default=DEFAULT_CONFIRM,
+                        help="Times a suspected regression is timed again before it fails the run")
+    parser.add_argument("--no-imports", action="store_true", help="Skip the import-time benchmarks")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.selection, args.repeats, not args.no_imports)
+    report = {"environment": environment(), "results": results}
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        stored = json.loads(baseline_path.read_text())["results"] if baseline_path.exists() else {}
+        stored.update(results)
+        baseline_path.write_text(json.dumps({"environment": environment(), "results": stored}, indent=2) + "\n")
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+
+    regressions = []
+    if baseline_path.exists():
+        report["tolerance"] = args.tolerance
+        report["comparison"] = confirm(results, json.loads(baseline_path.read_text())["results"], args.tolerance,
+                                       args.repeats, args.confirm)
+        for name, entry in report["comparison"].items():
+            ratio = "" if entry["ratio"] is None else f"{entry['ratio']:.2f}x baseline"
+            print(f"{entry['status']:10} {name:45} {ratio}")
+            if entry["status"] == "regression":
+                regressions.append(name)
+    else:
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one.")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from gui.plotting import plot_P_vs_T, plot_T_vs_s, plot_efficiency_vs_rp, plot_net_work_vs_rp
-from simulation.brayton_cycle import BraytonCycle
+from gui.worker import SimulationWorker
+from simulation.cache import CycleCache
+from simulation import profiling
 from tkinter import filedialog
-import math
+from gui.model import PLOT_TYPES, PRESETS, simulate, replot
 
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
@@ -15,32 +16,9 @@ class JetEngineApp(ctk.CTk):
         self.geometry("600x500")
         self.resizable(True, True)
         self.current_figure = None
-        self.presets = {
-                        "Standard Jet": {
-                            "T1": 288,
-                            "P1": 101325,
-                            "rp": 10,
-                            "Tmax": 1600,
-                            "eta_c": 0.85,
-                            "eta_t": 0.88,
-                        },
-                        "High Efficiency": {
-                            "T1": 288,
-                            "P1": 101325,
-                            "rp": 30,
-                            "Tmax": 1900,
-                            "eta_c": 0.9,
-                            "eta_t": 0.93,
-                        },
-                        "Low Bypass (Test)": {
-                            "T1": 273,
-                            "P1": 95000,
-                            "rp": 15,
-                            "Tmax": 1700,
-                            "eta_c": 0.82,
-                            "eta_t": 0.85,
-                        }
-                    }
+        self.last_output = None     # Latest simulate() output, reused when only the plot type changes
+        self.cycle_cache = CycleCache(maxsize=256)
+        self.presets = PRESETS
         self.input_bounds = {
                             "T1": (200, 400),             # Kelvin
                             "P1": (50000, 500000),        # Pascals
@@ -52,6 +30,7 @@ class JetEngineApp(ctk.CTk):
         self.plot_type_dropdown = None
         self.sliders = {}
         self.create_widgets()
+        self.worker = SimulationWorker(self)
 
     def build_left_frame(self, frame):
         page_dropdown = ctk.CTkComboBox(frame, values=["Theoretical", "Practical"], width=140, state="readonly")
@@ -127,6 +106,7 @@ class JetEngineApp(ctk.CTk):
                     rounded = round(float(val), decimal_points)
                     e.delete(0, "end")
                     e.insert(0, f"{rounded}")
+                    self.schedule_simulation()  # Bursts of drag events are coalesced by the worker
 
                 # Define sync: Entry → Slider
                 def update_slider(event, s=slider, e=entry):
@@ -158,11 +138,7 @@ class JetEngineApp(ctk.CTk):
     def build_right_frame(self, frame):
         # Dropdown top left
         self.plot_type_dropdown = ctk.CTkComboBox(frame, 
-                                                  values=[
-                                                      "P vs T", 
-                                                      "T vs s", 
-                                                      "Efficiency vs Pressure Ratio", 
-                                                      "Net Work vs Pressure Ratio"], 
+                                                  values=list(PLOT_TYPES), 
                                                   width=180, 
                                                   state="readonly",
                                                   command=self.update_plot)
@@ -177,6 +153,13 @@ class JetEngineApp(ctk.CTk):
         # Graph Canvas
         self.graph_canvas = ctk.CTkFrame(frame, fg_color="black")
         self.graph_canvas.grid(row=1, column=1, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.plots = None  # PlotManager, created with the first plot (defers matplotlib)
+
+        # Profiling toggle: stage timings are appended to the output box while it is on
+        self.profile_switch = ctk.CTkCheckBox(frame, text="Profile", width=80, command=self.toggle_profiling)
+        self.profile_switch.grid(row=0, column=0, sticky="w", padx=10, pady=(10, 0))
+        if profiling.enabled():
+            self.profile_switch.select()
 
         # Save Button
         save_btn = ctk.CTkButton(frame, text="Save Graph", command=self.save_graph)
@@ -233,8 +216,26 @@ class JetEngineApp(ctk.CTk):
                 except ValueError:
                     pass
     
+    def toggle_profiling(self):
+        if self.profile_switch.get():
+            profiling.reset()
+            profiling.enable()
+        else:
+            profiling.disable()
+
     def update_plot(self, _=None):
-        self.run_simulation()
+        # Switching plot type with unchanged inputs only builds the new plot's data
+        try:
+            inputs = {key: float(entry.get()) for key, entry in self.entries.items()}
+        except ValueError:
+            inputs = None
+        if self.last_output is None or inputs != self.last_output["inputs"]:
+            self.run_simulation()
+            return
+
+        output = self.last_output
+        plot_type = self.plot_type_dropdown.get()
+        self.worker.submit(lambda: replot(output, plot_type), self.show_simulation, self.show_simulation_error)
 
     def reset(self):
         # Clear all input entries
@@ -245,80 +246,59 @@ class JetEngineApp(ctk.CTk):
         self.output_box.delete("0.0", "end")
         self.output_box.insert("0.0", "Output will appear here...\n")
 
-        # Clear graph canvas (plot area)
-        for widget in self.graph_canvas.winfo_children():
-            widget.destroy()
+        # Clear graph canvas (plot area); the figures themselves are kept for reuse
+        if self.plots is not None:
+            self.plots.clear()
+        self.current_figure = None
+        self.last_output = None
 
     def run_simulation(self):
         if not self.validate_inputs():
             print("Invalid input detected.")
             return
 
-        try:
-            T1 = float(self.entries["T1"].get())
-            P1 = float(self.entries["P1"].get())
-            rp = float(self.entries["rp"].get())
-            Tmax = float(self.entries["Tmax"].get())
-            eta_c = float(self.entries["eta_c"].get())
-            eta_t = float(self.entries["eta_t"].get())
-
-            brayton_cycle_instance = BraytonCycle(T1, P1, rp, Tmax)
-            brayton_cycle_instance.run()
-            results = brayton_cycle_instance.get_results()
-
-            result_text = f"Simulation Results:\n"
-
-            for key, value in results.items():
-                result_text += f"{key}: {value:.2f}\n"
+        self.submit_simulation()
 
-            self.output_box.delete("0.0", "end")
-            self.output_box.insert("0.0", result_text)
+    def schedule_simulation(self, _=None):
+        # Live updates while dragging sliders; incomplete or out-of-range inputs are skipped quietly
+        if self.validate_inputs():
+            self.submit_simulation()
 
-            # Plot setup
-            T2 = results["T2"]
-            T3 = results["T3"]
-            T4 = results["T4"]
-            T_vals = [T1, T2, T3, T4, T1]
-
-            P2 = P1 * rp
-            P3 = P2
-            P4 = P1
-            P_vals = [P1, P2, P3, P4, P1]
-
-
-            plot_type = self.plot_type_dropdown.get()
-
-            if plot_type == "P vs T":
-                self.current_figure = plot_P_vs_T(self.graph_canvas, T_vals, P_vals)
-            elif plot_type == "T vs s":
-                cp = 1005 # J/kg·K (ideal air)
-                gamma = 1.4
-                R = cp * (1 - 1 / gamma)
-
-                s1 = 0
-                s2 = s1 + (cp * math.log(T2 / T1) - R * math.log(P2 / P1)) / 1000
-                s3 = s2 + (cp * math.log(T3 / T2)) / 1000
-                s4 = s3 + (cp * math.log(T4 / T3) - R * math.log(P1 / P2)) / 1000
-                s1_closure = s4 + (cp * math.log(T1 / T4)) / 1000
+    def submit_simulation(self):
+        # Inputs are read here on the Tk thread; the simulation and figure construction run on the
+        # worker thread and the result is shown by show_simulation once the latest job finishes
+        try:
+            inputs = {key: float(entry.get()) for key, entry in self.entries.items()}
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numeric values.")
+            return
 
-                s_vals = [s1, s2, s3, s4, s1_closure]
+        plot_type = self.plot_type_dropdown.get()
+        self.worker.submit(lambda: simulate(inputs, plot_type, self.cycle_cache),
+                           self.show_simulation,
+                           self.show_simulation_error)
 
-                self.current_figure = plot_T_vs_s(self.graph_canvas, s_vals, T_vals)
-            elif plot_type == "Efficiency vs Pressure Ratio":
-                self.current_figure = plot_efficiency_vs_rp(self.graph_canvas)
-            elif plot_type == "Net Work vs Pressure Ratio":
-                T1 = float(self.entries["T1"].get())
-                Tmax = float(self.entries["Tmax"].get())
-                eta_c = float(self.entries["eta_c"].get())
-                eta_t = float(self.entries["eta_t"].get())
+    def show_simulation(self, output):
+        self.last_output = output
+        self.output_box.delete("0.0", "end")
+        self.output_box.insert("0.0", output["text"])
 
-                self.current_figure = plot_net_work_vs_rp(
-                    self.graph_canvas, T1, Tmax, eta_c, eta_t
-                )
+        if output["plot_data"] is not None:
+            if self.plots is None:
+                from gui.plotting import PlotManager
+                self.plots = PlotManager(self.graph_canvas, blit=True, worker=self.worker)
+            self.current_figure = self.plots.show(output["plot_type"], *output["plot_data"])
 
+        if profiling.enabled():
+            # Drawing happens after this returns (on the worker, or from draw_idle for heatmaps), so
+            # plot.draw lags one update behind
+            self.output_box.insert("end", "\n" + profiling.summary())
 
-        except ValueError:
+    def show_simulation_error(self, error):
+        if isinstance(error, ValueError):
             messagebox.showerror("Input Error", "Please enter valid numeric values.")
+        else:
+            messagebox.showerror("Simulation Error", str(error))
 
     def validate_inputs(self):
         for key, entry in self.entries.items():
@@ -345,6 +325,7 @@ class JetEngineApp(ctk.CTk):
         file_path = filedialog.asksaveasfilename(defaultextension=".png",
                                                 filetypes=[("PNG Image", "*.png"),
                                                             ("PDF File", "*.pdf"),
+                                                            ("SVG Image", "*.svg"),
                                                             ("All Files", "*.*")],
                                                 title="Save Plot As")
         if file_path:
@@ -0,0 +1,150 @@
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gui.model import PLOT_TYPES, PRESETS, plot_data
+
+# Headless report export: renders plot type × preset × operating point figures to PNG/PDF/SVG with
+# the Agg backend, spread over a pool of worker processes. Nothing here imports Tk, so it runs
+# without a display.
+#
+#   python -m gui.export report/ --formats png pdf --vary rp=2:40:20 --vary Tmax=1400,1600,1800
+#
+#   jobs = report_jobs(variations={"rp": [5, 10, 20, 30]})
+#   paths = export_figures(jobs, "report/", formats=("png", "svg"), workers=8)
+#
+# Jobs are sorted by plot type and handed out in batches, and every worker keeps the templates it
+# has built (one Figure and Agg canvas per plot type), so a figure costs an in-place update and a
+# save, as in the GUI, rather than building a new figure.
+
+EXPORT_FORMATS = ("png", "pdf", "svg")
+
+def report_jobs(plot_types=PLOT_TYPES, presets=PRESETS, variations=None):
+    # (plot_type, file stem, inputs) for every plot type × preset × combination of `variations`,
+    # e.g. variations={"rp": [5, 10, 20], "Tmax": [1400, 1600]} replaces those inputs of each preset
+    variations = variations or {}
+    names = list(variations)
+    jobs = []
+    for preset_name, preset in presets.items():
+        for values in itertools.product(*(variations[name] for name in names)):
+            inputs = {key: float(value) for key, value in preset.items()}
+            inputs.update(zip(names, (float(value) for value in values)))
+            point = "_".join(f"{name}={float(value):g}" for name, value in zip(names, values))
+            for plot_type in plot_types:
+                stem = "__".join(_slug(part) for part in (preset_name, plot_type, point) if part)
+                jobs.append((plot_type, stem, inputs))
+    return jobs
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9.=-]+", "_", text).strip("_")
+
+def export_figures(jobs, directory, formats=("png",), workers=None, dpi=100, batch_size=None):
+    # Renders every job to directory/<stem>.<format> and returns the written paths in job order
+    # (grouped by plot type). workers=None uses every core; workers=1 renders in this process.
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unsupported format(s): {', '.join(unknown)}")
+    os.makedirs(directory, exist_ok=True)
+    jobs = sorted(jobs, key=lambda job: job[0])    # stable: keeps the order within a plot type
+    formats = tuple(formats)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return _render(jobs, directory, formats, dpi)
+
+    # A few batches per worker balances the load; batches stay small enough that a slow plot type
+    # does not hold back the end of the report
+    batch_size = batch_size or max(1, min(64, -(-len(jobs) // (4 * workers))))
+    batches = [jobs[start:start + batch_size] for start in range(0, len(jobs), batch_size)]
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_paths in pool.map(_render, batches, itertools.repeat(directory),
+                                    itertools.repeat(formats), itertools.repeat(dpi)):
+            paths.extend(batch_paths)
+    return paths
+
+# Per process: plot type → (template, canvas), and the cycle cache shared by all of its jobs
+_templates = {}
+_cycle_cache = None
+
+def _render(jobs, directory, formats, dpi):
+    # Also the worker entry point. Matplotlib is imported here so the parent process only needs it
+    # when it renders itself.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from gui.plotting import PLOT_TEMPLATES
+    from simulation.cache import CycleCache
+
+    global _cycle_cache
+    if _cycle_cache is None:
+        _cycle_cache = CycleCache(maxsize=1024)
+
+    paths = []
+    for plot_type, stem, inputs in jobs:
+        entry = _templates.get(plot_type)
+        if entry is None:
+            template = PLOT_TEMPLATES[plot_type]()
+            entry = _templates[plot_type] = (template, FigureCanvasAgg(template.figure))
+        template, _ = entry
+
+        results = _cycle_cache.run(inputs["T1"], inputs["P1"], inputs["rp"], inputs["Tmax"],
+                                   eta_c=inputs["eta_c"], eta_t=inputs["eta_t"])
+        data = plot_data(inputs, results, plot_type)
+        if data is None:
+            raise ValueError(f"Plot type '{plot_type}' cannot be exported.")
+        template.update(*data)
+        for fmt in formats:
+            path = os.path.join(directory, f"{stem}.{fmt}")
+            template.figure.savefig(path, format=fmt, dpi=dpi)
+            paths.append(path)
+    return paths
+
+def _parse_variation(text):
+    # "rp=5,10,20" (values) or "rp=2:40:20" (start:stop:count, evenly spaced) → ("rp", values)
+    name, _, values = text.partition("=")
+    if not values:
+        raise ValueError(f"Expected INPUT=VALUES, got '{text}'")
+    if ":" in values:
+        start, stop, count = values.split(":")
+        return name.strip(), np.linspace(float(start), float(stop), int(count)).tolist()
+    return name.strip(), [float(value) for value in values.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render report figures for plot types × presets × operating "
+                                                 "points, without a display.")
+    parser.add_argument("directory", help="Output directory (created if needed)")
+    parser.add_argument("--formats", nargs="+", default=["png"], choices=EXPORT_FORMATS, help="File formats")
+    parser.add_argument("--plot-types", nargs="+", default=list(PLOT_TYPES), metavar="TYPE",
+                        help="Plot types (default: all)")
+    parser.add_argument("--presets", nargs="+", default=list(PRESETS), metavar="NAME",
+                        help="Presets (default: all)")
+    parser.add_argument("--vary", action="append", default=[], metavar="INPUT=VALUES",
+                        help="Operating points around each preset: rp=5,10,20 or rp=2:40:20 (start:stop:count); "
+                             "repeat for a grid over several inputs")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--dpi", type=float, default=100, help="Raster resolution")
+    args = parser.parse_args(argv)
+
+    try:
+        unknown = [name for name in args.plot_types if name not in PLOT_TYPES]
+        unknown += [name for name in args.presets if name not in PRESETS]
+        if unknown:
+            raise ValueError(f"Unknown plot type(s) or preset(s): {', '.join(unknown)}")
+        variations = dict(_parse_variation(text) for text in args.vary)
+        jobs = report_jobs(args.plot_types, {name: PRESETS[name] for name in args.presets}, variations)
+        start = time.perf_counter()
+        paths = export_figures(jobs, args.directory, args.formats, args.workers, args.dpi)
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    print(f"Wrote {len(paths)} files ({len(jobs)} figures) → {args.directory} "
+          f"in {time.perf_counter() - start:.1f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
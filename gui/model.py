@@ -0,0 +1,108 @@
+from simulation import profiling
+
+# The Tk-free half of the app: presets, plot types and the simulate/plot data functions that run on
+# the SimulationWorker thread. Headless users (figure export, benchmarks) import this module instead
+# of gui.app, so they never load customtkinter.
+
+PRESETS = {
+    "Standard Jet": {
+        "T1": 288,
+        "P1": 101325,
+        "rp": 10,
+        "Tmax": 1600,
+        "eta_c": 0.85,
+        "eta_t": 0.88,
+    },
+    "High Efficiency": {
+        "T1": 288,
+        "P1": 101325,
+        "rp": 30,
+        "Tmax": 1900,
+        "eta_c": 0.9,
+        "eta_t": 0.93,
+    },
+    "Low Bypass (Test)": {
+        "T1": 273,
+        "P1": 95000,
+        "rp": 15,
+        "Tmax": 1700,
+        "eta_c": 0.82,
+        "eta_t": 0.85,
+    }
+}
+
+# Heatmap plot types and the cycle output they show over rp × Tmax
+DESIGN_MAP_FIELDS = {
+    "Efficiency Map (rp × Tmax)": "eta_actual",
+    "Net Work Map (rp × Tmax)": "w_net",
+}
+
+# Grid evaluated for each heatmap on the worker thread. Frames shown on the Tk thread are strided
+# from it (no kernel evaluation, no averaging); the exact pixel-resolution frames come from the worker.
+DESIGN_MAP_RESOLUTION = (512, 512)
+
+# Plot types offered by the app's dropdown, in order
+PLOT_TYPES = ("P vs T", "T vs s", "P vs v", "Efficiency vs Pressure Ratio", "Net Work vs Pressure Ratio",
+              "Efficiency vs Tmax", *DESIGN_MAP_FIELDS)
+
+def simulate(inputs, plot_type, cycle_cache):
+    # Everything run_simulation needs that does not touch Tk: runs on the SimulationWorker thread.
+    # Returns the plot data only; the persistent figures are updated on the Tk thread.
+
+    # Repeated operating points (e.g. slider values seen before) come from the cache
+    with profiling.timed("simulate.cycle"):
+        results = cycle_cache.run(inputs["T1"], inputs["P1"], inputs["rp"], inputs["Tmax"],
+                                  eta_c=inputs["eta_c"], eta_t=inputs["eta_t"])
+
+    result_text = f"Simulation Results:\n"
+
+    for key, value in results.items():
+        result_text += f"{key}: {value:.2f}\n"
+
+    return {"inputs": inputs, "results": results, "text": result_text, "plot_type": plot_type,
+            "plot_data": plot_data(inputs, results, plot_type)}
+
+def replot(output, plot_type):
+    # A previous simulate() output shown as another plot type; the cycle is not evaluated again
+    return dict(output, plot_type=plot_type, plot_data=plot_data(output["inputs"], output["results"], plot_type))
+
+def plot_data(inputs, results, plot_type):
+    # Data for one plot type at an evaluated operating point.
+    # NumPy is first imported here, off the UI thread, rather than at application startup.
+    from simulation.curves import (cycle_process_path, efficiency_vs_rp_curve, efficiency_vs_Tmax_curve,
+                                   net_work_vs_rp_curve, path_states)
+    from simulation.design_map import DesignMap
+
+    T1 = inputs["T1"]
+    P1 = inputs["P1"]
+    rp = inputs["rp"]
+    Tmax = inputs["Tmax"]
+    eta_c = inputs["eta_c"]
+    eta_t = inputs["eta_t"]
+
+    data = None
+    if plot_type in ("P vs T", "T vs s", "P vs v"):
+        # Dense process paths, cached per operating point, so switching between the cycle plots
+        # or returning to a point reuses them
+        with profiling.timed("simulate.process_path"):
+            path = cycle_process_path(T1, P1, rp, Tmax, eta_c, eta_t)
+        x, y = {"P vs T": ("T", "P"), "T vs s": ("s", "T"), "P vs v": ("v", "P")}[plot_type]
+        scale = {"P": 1e-3}      # Pa → kPa
+        data = (path[x] * scale.get(x, 1), path[y] * scale.get(y, 1), path_states())
+    elif plot_type == "Efficiency vs Pressure Ratio":
+        with profiling.timed("simulate.curves"):
+            data = efficiency_vs_rp_curve(1.4)
+    elif plot_type == "Net Work vs Pressure Ratio":
+        with profiling.timed("simulate.curves"):
+            data = net_work_vs_rp_curve(T1, Tmax, eta_c, eta_t, 1.4, 1005)
+    elif plot_type == "Efficiency vs Tmax":
+        with profiling.timed("simulate.curves"):
+            data = efficiency_vs_Tmax_curve(T1, rp, 1.4, eta_c, eta_t)
+    elif plot_type in DESIGN_MAP_FIELDS:
+        # The grid and its pyramid are evaluated here, off the UI thread; HeatmapPlot only takes
+        # cached frames from it and sends refinement passes back to the worker
+        with profiling.timed("simulate.design_map"):
+            data = (DesignMap(DESIGN_MAP_FIELDS[plot_type], T1, P1, eta_c, eta_t,
+                              resolution=DESIGN_MAP_RESOLUTION),)
+
+    return data
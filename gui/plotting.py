@@ -1,162 +1,395 @@
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import numpy as np
-
-def plot_P_vs_T(parent_frame, T_vals, P_vals):
-    # Clear previous plot
-    for widget in parent_frame.winfo_children():
-        widget.destroy()
-
-    fig = Figure(figsize=(5, 4), dpi=100)
-    ax = fig.add_subplot(111)
-
-    ax.plot(T_vals, P_vals, marker="o")
-
-    labels = ["1 (Inlet)", "2 (Post-Comp)", "3 (Max T)", "4 (Post-Turb)"]
-    offset = [(0, -10), (0, 10), (0, 10), (0, -10)]
-
-    for i, (T, P) in enumerate(zip(T_vals[:-1], P_vals[:-1])):
-        label = labels[i]
-        ax.annotate(label, (T, P),
-                    textcoords="offset points", 
-                    xytext=offset[i], 
-                    ha='center', fontsize=8, color="gray", fontweight="bold")
-
-
-    ax.set_xlabel("Temperature (K)")
-    ax.set_ylabel("Pressure (kPa)")
-    ax.set_title("Brayton Cycle - P vs T")
-    ax.grid(True)
-
-    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    return fig
-
-def plot_T_vs_s(parent_frame, s_vals, T_vals):
-    # Clear previous plot
-    for widget in parent_frame.winfo_children():
-        widget.destroy()
-
-    fig = Figure(figsize=(5, 4), dpi=100)
-    ax = fig.add_subplot(111)
-
-    ax.plot(s_vals, T_vals, marker="o")
-
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from simulation import profiling
+
+# Plot templates own one Figure and its artists and update them in place. They do not touch Tk,
+# so they can also be rendered headless; PlotManager embeds them in the GUI.
+class PlotTemplate:
+    interactive = False     # changes its own figure from Tk events (see connect())
+    fill = 0.6
+    headroom = 0.15
+
+    def __init__(self, xlabel, ylabel, title):
+        self.figure = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_title(title)
+        self.ax.grid(True)
+
+    def artists(self):
+        # Artists whose data changes between updates
+        return []
+
+    def connect(self, canvas, worker=None):
+        # Called once the figure is embedded in an interactive canvas; `worker` (gui.worker) takes
+        # jobs too heavy for the Tk thread
+        pass
+
+    def _rescale(self):
+        # Returns True when the axis limits changed, i.e. the static background must be redrawn.
+        # Limits stay put while the data fits inside them and spans at least `fill` of them, so
+        # slider steps can be blitted; otherwise they are refitted with `headroom` of the data span
+        # to spare on each side, which leaves room for the next steps.
+        limits = (self.ax.get_xlim(), self.ax.get_ylim())
+        self.ax.relim()
+        bounds = self.ax.dataLim
+        for (low, high), get_limits, set_limits in (((bounds.x0, bounds.x1), self.ax.get_xlim, self.ax.set_xlim),
+                                                    ((bounds.y0, bounds.y1), self.ax.get_ylim, self.ax.set_ylim)):
+            if not low <= high:     # no finite data
+                continue
+            lower, upper = get_limits()
+            if lower <= low and high <= upper and high - low >= self.fill * (upper - lower):
+                continue
+            margin = self.headroom * ((high - low) or max(abs(low), 1))
+            set_limits(low - margin, high + margin)
+        return limits != (self.ax.get_xlim(), self.ax.get_ylim())
+
+class CyclePlot(PlotTemplate):
+    # Cycle 1 → 2 → 3 → 4 → 1 with labelled state points: either just the five states, or a dense
+    # process path with the indices of the states in it (simulation.curves.path_states)
     labels = ["1 (Inlet)", "2 (Post-Comp)", "3 (Max T)", "4 (Post-Turb)"]
     offset = [(0, -10), (0, 10), (0, 10), (0, -10)]
 
-    for i, (s, T) in enumerate(zip(s_vals[:-1], T_vals[:-1])):
-        label = labels[i]
-        ax.annotate(label, (s, T),
-                    textcoords="offset points", 
-                    xytext=offset[i], 
-                    ha='center', fontsize=8, color="gray", fontweight="bold")
-
-    ax.set_xlabel("Entropy (arb. units)")
-    ax.set_ylabel("Temperature (K)")
-    ax.set_title("Brayton Cycle - T vs s")
-    ax.grid(True)
-
-    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    return fig
-
-def plot_efficiency_vs_rp(parent_frame, gamma=1.4):
-    # Clear previous plot
-    for widget in parent_frame.winfo_children():
-        widget.destroy()
-
-    fig = Figure(figsize=(5, 4), dpi=100)
-    ax = fig.add_subplot(111)
-
-    # Pressure ratio range
-    rp_vals = [x / 10 for x in range(15, 401)]  # From 1.5 to 40 in 0.1 steps
-    eta_vals = [1 - (1 / (rp ** ((gamma - 1) / gamma))) for rp in rp_vals]
-
-    ax.plot(rp_vals, eta_vals, color="blue", linewidth=2)
-    ax.set_xlabel("Pressure Ratio (rp)")
-    ax.set_ylabel("Thermal Efficiency (η)")
-    ax.set_title("Thermal Efficiency vs Pressure Ratio")
-    ax.grid(True)
-
-    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    return fig
-
-def plot_net_work_vs_rp(parent_frame, T1, Tmax, eta_c, eta_t, gamma=1.4, cp=1005):
-    # Clear previous plot
-    for widget in parent_frame.winfo_children():
-        widget.destroy()
-
-
-    rp_range = np.linspace(1.5, 40, 100)
-    net_work = []
-
-    for rp in rp_range:
-        T2 = T1 * (rp ** ((gamma - 1) / gamma / eta_c))
-        T4 = Tmax * (1 / rp) ** ((gamma - 1) / gamma * eta_t)
-
-        W_in = cp * (T2 - T1)
-        W_out = cp * (Tmax - T4)
-        W_net = W_out - W_in
-        net_work.append(W_net)
-
-    fig = Figure(figsize=(5, 4), dpi=100)
-    ax = fig.add_subplot(111)
-    ax.plot(rp_range, net_work, color="green")
-
-    ax.set_title("Net Work Output vs Pressure Ratio")
-    ax.set_xlabel("Pressure Ratio (rp)")
-    ax.set_ylabel("Net Work Output (J/kg)")
-    ax.grid(True)
-
-    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    return fig
-
-def plot_efficiency_vs_Tmax(parent_frame, T1, rp, gamma):
-    import numpy as np
-
-    # Clear previous plot
-    for widget in parent_frame.winfo_children():
-        widget.destroy()
-
-    cp = 1005  # J/kg·K
-    T2 = T1 * (rp ** ((gamma - 1) / gamma))
-    Tmax_range = np.linspace(T2 + 50, 1500, 100)
-    efficiencies = []
-
-    for T3 in Tmax_range:
-        T4 = T3 * (1 / rp) ** ((gamma - 1) / gamma)
-        print(f"T4: {T4}")
-
-        work_comp = cp * (T2 - T1)
-        work_turb = cp * (T3 - T4)
-        q_in = cp * (T3 - T2)
-
-        eta = (work_turb - work_comp) / q_in
-        print(eta)
-        efficiencies.append(eta)
-
-    # Plot
-    fig = Figure(figsize=(5, 4), dpi=100)
-    ax = fig.add_subplot(111)
-    ax.plot(Tmax_range, efficiencies, color='orange')
-    ax.set_xlabel("Maximum Temperature (Tmax) [K]")
-    ax.set_ylabel("Thermal Efficiency (η)")
-    ax.set_title("Thermal Efficiency vs Tmax")
-    ax.grid(True)
-
-    canvas = FigureCanvasTkAgg(fig, master=parent_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    return fig
+    def __init__(self, xlabel, ylabel, title, offset=None):
+        super().__init__(xlabel, ylabel, title)
+        self.line, = self.ax.plot([], [], marker="o")
+        self.annotations = [self.ax.annotate(label, (0, 0),
+                                             textcoords="offset points",
+                                             xytext=offset,
+                                             ha='center', fontsize=8, color="gray", fontweight="bold")
+                            for label, offset in zip(self.labels, offset or self.offset)]
+
+    def artists(self):
+        return [self.line, *self.annotations]
+
+    def update(self, x_vals, y_vals, states=None):
+        self.line.set_data(x_vals, y_vals)
+        self.line.set_markevery(None if states is None else list(states))
+        if states is None:
+            states = range(len(x_vals))
+        for annotation, state in zip(self.annotations, states):
+            annotation.xy = (x_vals[state], y_vals[state])
+        return self._rescale()
+
+class CurvePlot(PlotTemplate):
+    def __init__(self, xlabel, ylabel, title, color, linewidth=None):
+        super().__init__(xlabel, ylabel, title)
+        self.line, = self.ax.plot([], [], color=color, linewidth=linewidth)
+
+    def artists(self):
+        return [self.line]
+
+    def update(self, x_vals, y_vals):
+        self.line.set_data(x_vals, y_vals)
+        return self._rescale()
+
+class HeatmapPlot(PlotTemplate):
+    # A DesignMap (simulation.design_map) over rp × Tmax as an image with contour lines. The level
+    # of detail follows the interaction: while the view is zoomed (scroll wheel) or panned (drag)
+    # every frame uses a coarse view of the map, and once the view has been still for
+    # `refine_delay` ms it is redrawn at the pixel resolution of the axes. Double-click resets the view.
+    # Connected to a worker, the Tk thread only draws frames strided from the map's precomputed grid
+    # (new maps from update() included); the pixel-resolution frame is evaluated exactly on the
+    # worker and drawn when it arrives, unless the map or the view has changed in the meantime.
+    interactive = True
+    coarse_shape = (64, 64)
+    contour_size = 128      # contour lines are traced on at most this many values per side
+    refine_delay = 150      # [ms]
+    zoom_factor = 1.25
+
+    def __init__(self, title, label, cmap, levels=10):
+        super().__init__("Pressure Ratio (rp)", "Maximum Temperature (Tmax) [K]", title)
+        self.ax.grid(False)
+        self.image = self.ax.imshow(np.full((1, 1), np.nan), origin="lower", aspect="auto", cmap=cmap,
+                                    extent=(0, 1, 0, 1))
+        self.figure.colorbar(self.image, ax=self.ax, label=label)
+        self.levels = levels
+        self.contours = None
+        self.design_map = None
+        self.canvas = None
+        self.worker = None
+        self._timer = None
+        self._drag = None
+
+    def update(self, design_map):
+        # Always needs a full draw (returns True): the image extent and contour lines change with the
+        # data. A zoomed view is kept while the map covers the same design space.
+        previous = self.design_map
+        self.design_map = design_map
+        if previous is None or (previous.rp_range, previous.Tmax_range) != (design_map.rp_range,
+                                                                            design_map.Tmax_range):
+            self._reset_view()
+        if self.worker is None:
+            self.render()
+        else:
+            # Strided from the grid at pixel size until the refined frame arrives
+            self._draw(*self.design_map.view(self.ax.get_xlim(), self.ax.get_ylim(), self._pixels(), True))
+            self._schedule_refine()
+        return True
+
+    def render(self, coarse=False):
+        shape = self.coarse_shape if coarse else self._pixels()
+        self._draw(*self.design_map.view(self.ax.get_xlim(), self.ax.get_ylim(), shape, coarse))
+
+    def _draw(self, extent, values):
+        self.image.set_data(values)
+        self.image.set_extent(extent)
+
+        if self.contours is not None:
+            self.contours.remove()
+            self.contours = None
+        finite = values[np.isfinite(values)]
+        if finite.size == 0 or finite.min() == finite.max():
+            return
+        self.image.set_clim(finite.min(), finite.max())
+        row_step = -(-values.shape[0] // self.contour_size)
+        column_step = -(-values.shape[1] // self.contour_size)
+        lines = values[::row_step, ::column_step]
+        if min(lines.shape) >= 2:
+            x = np.linspace(extent[0], extent[1], values.shape[1])[::column_step]
+            y = np.linspace(extent[2], extent[3], values.shape[0])[::row_step]
+            self.contours = self.ax.contour(x, y, lines, levels=self.levels, colors="black", linewidths=0.5)
+
+    def _pixels(self):
+        box = self.ax.get_window_extent()
+        return max(int(box.height), 1), max(int(box.width), 1)
+
+    def _reset_view(self):
+        self.ax.set_xlim(self.design_map.rp_range)
+        self.ax.set_ylim(self.design_map.Tmax_range)
+
+    def connect(self, canvas, worker=None):
+        self.canvas = canvas
+        self.worker = worker
+        canvas.mpl_connect("scroll_event", self._on_scroll)
+        canvas.mpl_connect("button_press_event", self._on_press)
+        canvas.mpl_connect("motion_notify_event", self._on_motion)
+        canvas.mpl_connect("button_release_event", self._on_release)
+        canvas.mpl_connect("resize_event", lambda event: self._interact())
+        self._timer = canvas.new_timer(interval=self.refine_delay)
+        self._timer.single_shot = True
+        self._timer.add_callback(self._refine)
+
+    def _on_scroll(self, event):
+        # Zoom about the cursor
+        if event.inaxes is not self.ax or self.design_map is None:
+            return
+        scale = 1 / self.zoom_factor if event.button == "up" else self.zoom_factor
+        x_low, x_high = self.ax.get_xlim()
+        y_low, y_high = self.ax.get_ylim()
+        self.ax.set_xlim(event.xdata - (event.xdata - x_low) * scale, event.xdata + (x_high - event.xdata) * scale)
+        self.ax.set_ylim(event.ydata - (event.ydata - y_low) * scale, event.ydata + (y_high - event.ydata) * scale)
+        self._interact()
+
+    def _on_press(self, event):
+        if event.inaxes is not self.ax or event.button != 1 or self.design_map is None:
+            return
+        if event.dblclick:
+            self._reset_view()
+            self._interact()
+        else:
+            self._drag = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _on_motion(self, event):
+        # Pan: the view follows the cursor, measured in pixels from where the drag started
+        if self._drag is None or event.x is None:
+            return
+        x, y, (x_low, x_high), (y_low, y_high) = self._drag
+        box = self.ax.get_window_extent()
+        dx = (event.x - x) * (x_high - x_low) / box.width
+        dy = (event.y - y) * (y_high - y_low) / box.height
+        self.ax.set_xlim(x_low - dx, x_high - dx)
+        self.ax.set_ylim(y_low - dy, y_high - dy)
+        self._interact()
+
+    def _on_release(self, event):
+        self._drag = None
+
+    def _interact(self):
+        # Coarse frame now; full resolution once no interaction has followed for refine_delay
+        if self.design_map is None:
+            return
+        self.render(coarse=True)
+        self.canvas.draw_idle()
+        self._schedule_refine()
+
+    def _schedule_refine(self):
+        self._timer.stop()
+        self._timer.start()
+
+    def _refine(self):
+        if self.worker is None:
+            with profiling.timed("plot.refine"):
+                self.render()
+            self.canvas.draw_idle()
+            return
+
+        design_map, view, shape = self.design_map, (self.ax.get_xlim(), self.ax.get_ylim()), self._pixels()
+
+        def job():
+            with profiling.timed("plot.refine"):
+                return design_map.exact_view(*view, shape)
+
+        def show(frame):
+            # Frames for a replaced map or a view that has moved on are dropped
+            if design_map is self.design_map and view == (self.ax.get_xlim(), self.ax.get_ylim()):
+                self._draw(*frame)
+                self.canvas.draw_idle()
+
+        self.worker.submit(job, show, slot="plot.refine")
+
+PLOT_TEMPLATES = {
+    "P vs T": lambda: CyclePlot("Temperature (K)", "Pressure (kPa)", "Brayton Cycle - P vs T"),
+    "T vs s": lambda: CyclePlot("Entropy s - s1 (kJ/kg·K)", "Temperature (K)", "Brayton Cycle - T vs s"),
+    "P vs v": lambda: CyclePlot("Specific Volume (m³/kg)", "Pressure (kPa)", "Brayton Cycle - P vs v",
+                                offset=[(0, -10), (-10, 10), (20, 10), (0, -10)]),
+    "Efficiency vs Pressure Ratio": lambda: CurvePlot("Pressure Ratio (rp)", "Thermal Efficiency (η)",
+                                                      "Thermal Efficiency vs Pressure Ratio", "blue", 2),
+    "Net Work vs Pressure Ratio": lambda: CurvePlot("Pressure Ratio (rp)", "Net Work Output (J/kg)",
+                                                    "Net Work Output vs Pressure Ratio", "green"),
+    "Efficiency vs Tmax": lambda: CurvePlot("Maximum Temperature (Tmax) [K]", "Thermal Efficiency (η)",
+                                            "Thermal Efficiency vs Tmax", "orange"),
+    "Efficiency Map (rp × Tmax)": lambda: HeatmapPlot("Thermal Efficiency over rp × Tmax",
+                                                      "Thermal Efficiency (η)", "viridis"),
+    "Net Work Map (rp × Tmax)": lambda: HeatmapPlot("Net Work Output over rp × Tmax",
+                                                    "Net Work Output (J/kg)", "magma"),
+}
+
+class _EmbeddedPlot:
+    def __init__(self, plot_type, template, canvas):
+        self.slot = f"plot.render.{plot_type}"
+        self.template = template
+        self.canvas = canvas
+        self.background = None
+        self.rendering = False      # the worker is drawing the figure: Tk must not touch it
+        self.pending = None         # (data, full) shown while rendering, applied once it is done
+        self.redraw = False         # a full draw was requested while rendering
+
+class PlotManager:
+    # Creates each plot type's figure and Tk canvas once, then only swaps which canvas is packed
+    # and updates artist data in place. With blit=True, updates that keep the axis limits restore
+    # the cached background and redraw just the changing artists.
+    # With a worker, non-interactive templates are rendered into the canvas's Agg buffer on the
+    # worker thread; the Tk thread only sets the artist data and copies the finished image into
+    # the Tk canvas. Data shown while a render is running waits for it (newest wins). Interactive
+    # templates (heatmaps) change their figure from Tk events, so they are still drawn on Tk.
+    def __init__(self, parent_frame, blit=False, worker=None):
+        self.parent_frame = parent_frame
+        self.blit = blit
+        self.worker = worker        # handed to the templates for their background work
+        self._plots = {}
+        self._current = None
+
+    def show(self, plot_type, *data):
+        plot = self._plots.get(plot_type)
+        if plot is None:
+            with profiling.timed("plot.create"):
+                plot = self._plots[plot_type] = self._create(plot_type)
+
+        switched = plot is not self._current
+        if switched:
+            if self._current is not None:
+                self._current.canvas.get_tk_widget().pack_forget()
+            plot.canvas.get_tk_widget().pack(fill="both", expand=True)
+            self._current = plot
+
+        if plot.rendering:
+            plot.pending = (data, switched or (plot.pending is not None and plot.pending[1]))
+        else:
+            self._update(plot, data, switched)
+        return plot.template.figure
+
+    def clear(self):
+        if self._current is not None:
+            self._current.canvas.get_tk_widget().pack_forget()
+            self._current = None
+
+    def _create(self, plot_type):
+        template = PLOT_TEMPLATES[plot_type]()
+        plot = _EmbeddedPlot(plot_type, template, _tk_canvas(template.figure, self.parent_frame))
+        template.connect(plot.canvas, self.worker)
+        if self._on_worker(plot):
+            # Full draws requested by Tk (draw_idle, resizes) are rendered on the worker as well
+            plot.canvas.draw = lambda: self._request_draw(plot)
+        else:
+            # Full renders happen later from draw_idle, so the canvas's own draw is what gets timed
+            plot.canvas.draw = profiling.profiled("plot.draw")(plot.canvas.draw)
+        if self.blit:
+            for artist in template.artists():
+                artist.set_animated(True)
+            plot.canvas.mpl_connect("draw_event", lambda event: self._on_draw(plot))
+        return plot
+
+    def _on_worker(self, plot):
+        return self.worker is not None and not plot.template.interactive
+
+    def _update(self, plot, data, full):
+        with profiling.timed("plot.update"):
+            rescaled = plot.template.update(*data)
+        full = full or rescaled or not self.blit or plot.background is None
+        if self._on_worker(plot):
+            self._render(plot, full)
+        elif full:
+            plot.canvas.draw_idle()
+        else:
+            with profiling.timed("plot.blit"):
+                self._blit(plot)
+
+    def _request_draw(self, plot):
+        if plot.rendering:
+            plot.redraw = True
+        else:
+            self._render(plot, True)
+
+    def _render(self, plot, full):
+        # Agg only on the worker (draw_event handlers included); Tk is touched in done() alone
+        plot.rendering = True
+
+        def job():
+            if full:
+                with profiling.timed("plot.draw"):
+                    FigureCanvasAgg.draw(plot.canvas)
+            else:
+                with profiling.timed("plot.blit"):
+                    plot.canvas.restore_region(plot.background)
+                    self._draw_artists(plot)
+
+        def done(_):
+            plot.rendering = False
+            plot.canvas.blit()
+            pending, plot.pending = plot.pending, None
+            redraw, plot.redraw = plot.redraw, False
+            if pending is not None:
+                data, pending_full = pending
+                self._update(plot, data, pending_full or redraw)
+            elif redraw:
+                self._render(plot, True)
+
+        def failed(error):
+            plot.rendering = False
+            plot.pending = None
+            raise error
+
+        self.worker.submit(job, done, failed, slot=plot.slot)
+
+    def _on_draw(self, plot):
+        # A full draw renders everything but the animated artists: cache it, then draw those on top
+        plot.background = plot.canvas.copy_from_bbox(plot.template.figure.bbox)
+        self._draw_artists(plot)
+
+    def _blit(self, plot):
+        plot.canvas.restore_region(plot.background)
+        self._draw_artists(plot)
+        plot.canvas.blit(plot.template.figure.bbox)
+
+    def _draw_artists(self, plot):
+        for artist in plot.template.artists():
+            plot.template.ax.draw_artist(artist)
+
+def _tk_canvas(fig, master):
+    # The Tk backend is imported when a figure is first embedded, so headless users of the
+    # templates never load Tk
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return FigureCanvasTkAgg(fig, master=master)
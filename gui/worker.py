@@ -0,0 +1,97 @@
+import threading
+
+from simulation import profiling
+
+class SimulationWorker:
+    # Runs jobs on one background thread with single-slot, latest-wins queues: submitting while a
+    # job is waiting in the same slot replaces it, so a burst of slider events costs at most one job
+    # in flight plus the newest one. Slots are independent (e.g. "simulation" and "plot.refine"), so
+    # a plot refinement never displaces a pending simulation; waiting jobs run in submission order.
+    # Tk is not thread-safe, so results are handed back through widget.after() polling and callbacks
+    # always run on the Tk main loop.
+    def __init__(self, widget, poll_interval=15):
+        self.widget = widget
+        self.poll_interval = poll_interval  # [ms]
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {}          # slot → (generation, job, on_done, on_error) waiting to run
+        self._finished = {}         # slot → (generation, outcome, callback) waiting to be delivered
+        self._generation = {}       # slot → generation of the latest submitted job
+        self._delivered = {}        # slot → generation of the latest delivered job
+        self._polling = False
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="simulation-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, job, on_done, on_error=None, slot="simulation"):
+        # Called on the Tk main loop; returns immediately
+        with self._lock:
+            if self._pending.pop(slot, None) is not None:
+                profiling.count("worker.coalesced")
+            generation = self._generation[slot] = self._generation.get(slot, 0) + 1
+            self._pending[slot] = (generation, job, on_done, on_error)
+        self._wakeup.set()
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_interval, self._poll)
+
+    def busy(self, slot=None):
+        # Whether any job (of `slot`, or of any slot) is waiting, running or undelivered
+        with self._lock:
+            slots = self._generation if slot is None else (slot,)
+            return any(self._busy(slot) for slot in slots)
+
+    def _busy(self, slot):
+        return slot in self._pending or self._delivered.get(slot, 0) < self._generation.get(slot, 0)
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait()
+            if not self._running:
+                return
+            with self._lock:
+                if not self._pending:
+                    self._wakeup.clear()
+                    continue
+                slot = next(iter(self._pending))
+                generation, job, on_done, on_error = self._pending.pop(slot)
+                if not self._pending:
+                    self._wakeup.clear()
+
+            try:
+                with profiling.timed("worker.job"):
+                    finished = (generation, job(), on_done)
+            except Exception as error:
+                finished = (generation, error, on_error)
+
+            with self._lock:
+                # Results that were overtaken by a newer finished job of the same slot are dropped
+                previous = self._finished.get(slot)
+                if previous is None or previous[0] < generation:
+                    self._finished[slot] = finished
+
+    def _poll(self):
+        with self._lock:
+            finished, self._finished = self._finished, {}
+        deliveries = []
+        for slot, (generation, outcome, callback) in finished.items():
+            if generation > self._delivered.get(slot, 0):
+                self._delivered[slot] = generation
+                deliveries.append((outcome, callback))
+
+        with self._lock:
+            idle = not any(self._busy(slot) for slot in self._generation)
+        if idle or not self._running:
+            self._polling = False
+        else:
+            self.widget.after(self.poll_interval, self._poll)
+
+        for outcome, callback in deliveries:
+            if callback is not None:
+                callback(outcome)
+            elif isinstance(outcome, Exception):
+                raise outcome
@@ -0,0 +1,84 @@
+from functools import lru_cache
+
+import numpy as np
+
+R_AIR = 287.05  # Specific gas constant of air [J/kg·K]
+
+# NASA 7-coefficient polynomials for dry air (Burcat):
+# cp/R = a1 + a2 T + a3 T² + a4 T³ + a5 T⁴, with a6/a7 the enthalpy and entropy integration constants
+T_COMMON = 1000.0
+LOW_COEFFICIENTS = (3.56839620, -6.78729429e-04, 1.55371476e-06, -3.29937060e-12,
+                    -4.66395387e-13, -1.06234659e+03, 3.71582965)               # 200 - 1000 K
+HIGH_COEFFICIENTS = (3.08792717, 1.24597184e-03, -4.23718945e-07, 6.74774789e-11,
+                     -3.97076972e-15, -9.95262755e+02, 5.95960930)              # 1000 - 6000 K
+
+def _coefficients(T):
+    T = np.asarray(T, dtype=float)
+    low = np.array(LOW_COEFFICIENTS)[:, None]
+    high = np.array(HIGH_COEFFICIENTS)[:, None]
+    return np.where(T.ravel() < T_COMMON, low, high).reshape((7,) + T.shape)
+
+def cp_polynomial(T):
+    a1, a2, a3, a4, a5, _, _ = _coefficients(T)
+    return R_AIR * (a1 + T * (a2 + T * (a3 + T * (a4 + T * a5))))
+
+def h_polynomial(T):
+    a1, a2, a3, a4, a5, a6, _ = _coefficients(T)
+    return R_AIR * (T * (a1 + T * (a2 / 2 + T * (a3 / 3 + T * (a4 / 4 + T * a5 / 5)))) + a6)
+
+def s0_polynomial(T):
+    # Standard-state entropy s°(T); the pressure term -R ln(P/P_ref) is added by the caller
+    a1, a2, a3, a4, a5, _, a7 = _coefficients(T)
+    return R_AIR * (a1 * np.log(T) + T * (a2 + T * (a3 / 2 + T * (a4 / 3 + T * a5 / 4))) + a7)
+
+class UniformTable:
+    # y(x) sampled on a uniform grid; lookups compute the cell index directly (no search) and
+    # interpolate linearly, extrapolating linearly outside the grid
+    def __init__(self, x_start, x_step, values):
+        self.x_start = x_start
+        self.x_step = x_step
+        self.values = values
+        self.slopes = np.diff(values)
+
+    @classmethod
+    def inverse_of(cls, x, y, points):
+        # Tabulates x(y) on a uniform y grid for a monotonically increasing y(x)
+        y_grid = np.linspace(y[0], y[-1], points)
+        return cls(y_grid[0], y_grid[1] - y_grid[0], np.interp(y_grid, y, x))
+
+    def __call__(self, x):
+        position = np.array(x, dtype=float)
+        position -= self.x_start
+        position /= self.x_step
+        index = position.astype(np.intp)
+        np.clip(index, 0, len(self.slopes) - 1, out=index)
+        position -= index
+        position *= self.slopes[index]
+        position += self.values[index]
+        return position
+
+class AirTables:
+    # Air properties tabulated once on a uniform temperature grid. h and s° increase monotonically
+    # with T, so the inverse lookups are tabulated on uniform h and s° grids as well: every lookup is
+    # a direct index plus linear interpolation, with no search or per-point root finding.
+    def __init__(self, T_min=200.0, T_max=3000.0, step=0.5, inverse_refinement=4):
+        self.T = np.arange(T_min, T_max + step / 2, step)
+        self.cp_table = cp_polynomial(self.T)
+        self.h_table = h_polynomial(self.T)
+        self.s0_table = s0_polynomial(self.T)
+
+        self.cp = UniformTable(T_min, step, self.cp_table)
+        self.h = UniformTable(T_min, step, self.h_table)
+        self.s0 = UniformTable(T_min, step, self.s0_table)
+        inverse_points = inverse_refinement * len(self.T)
+        self.T_from_h = UniformTable.inverse_of(self.T, self.h_table, inverse_points)
+        self.T_from_s0 = UniformTable.inverse_of(self.T, self.s0_table, inverse_points)
+
+    def isentropic_exit_temperature(self, inlet_temperature, pressure_ratio):
+        # s°(T_exit) = s°(T_inlet) + R ln(P_exit/P_inlet)
+        return self.T_from_s0(self.s0(inlet_temperature) + R_AIR * np.log(pressure_ratio))
+
+@lru_cache(maxsize=None)
+def air_tables(T_min=200.0, T_max=3000.0, step=0.5):
+    # Shared, lazily built tables; build once and pass to BraytonCycle / BraytonCycleBatch as `air`
+    return AirTables(T_min, T_max, step)
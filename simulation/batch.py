@@ -0,0 +1,43 @@
+import numpy as np
+
+from simulation.cycle_kernel import RESULT_FIELDS, brayton_cycle_kernel
+from simulation.result_set import ResultSet
+
+class BraytonCycleBatch:
+    # Same cycle as BraytonCycle, evaluated for a whole batch of operating points at once.
+    # Every input may be a scalar or an array; all inputs are broadcast against each other.
+    def __init__(self, T1, P1, pressure_ratio, T_max, cp=1005, gamma=1.4, eta_c=1.0, eta_t=1.0, air=None):
+        self.T1 = np.asarray(T1, dtype=float)                          # Ambient temperature [K]
+        self.P1 = np.asarray(P1, dtype=float)                          # Ambient pressure [Pa]
+        self.pressure_ratio = np.asarray(pressure_ratio, dtype=float)  # Compressor pressure ratio (P2/P1)
+        self.T_max = np.asarray(T_max, dtype=float)                    # Maximum temperature after combustion [K]
+        self.cp = np.asarray(cp, dtype=float)                          # Specific heat of air at constant pressure [J/kg·K]
+        self.gamma = np.asarray(gamma, dtype=float)                    # Heat capacity ratio for air
+        self.eta_c = np.asarray(eta_c, dtype=float)                    # Compressor isentropic efficiency
+        self.eta_t = np.asarray(eta_t, dtype=float)                    # Turbine isentropic efficiency
+        self.air = air                                                 # Optional AirTables; replaces cp/gamma
+
+        self.shape = np.broadcast_shapes(self.T1.shape, self.P1.shape, self.pressure_ratio.shape,
+                                         self.T_max.shape, self.cp.shape, self.gamma.shape,
+                                         self.eta_c.shape, self.eta_t.shape)
+
+        # Output columns (to be calculated), a ResultSet once run
+        self.results = None
+
+    def __getattr__(self, name):
+        # Outputs (T2, w_net, ...) are zero-copy views of the result columns
+        if name in RESULT_FIELDS:
+            return None if self.results is None else self.results[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def run(self, out=None):
+        # `out` is an optional ResultSet (or dict of preallocated arrays, see empty_results) that is
+        # filled in place
+        if out is None:
+            out = ResultSet.empty(self.shape)
+        self.results = brayton_cycle_kernel(self.T1, self.P1, self.pressure_ratio, self.T_max,
+                                            eta_c=self.eta_c, eta_t=self.eta_t, cp=self.cp, gamma=self.gamma,
+                                            air=self.air, out=out)
+
+    def get_results(self):
+        return self.results
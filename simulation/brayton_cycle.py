@@ -1,68 +1,160 @@
-from simulation.thermodynamics import (
-    compressor_exit_temperature,
-    compressor_exit_pressure,
-    turbine_exit_temperature,
-    compressor_work,
-    turbine_work,
-    heat_added,
-    ideal_efficiency
-)
+from simulation import profiling
+from simulation.results import RESULT_FIELDS, CycleResult
+
+# The constant-property cycle as a dependency graph: each quantity maps to the inputs/quantities it
+# is computed from, in evaluation order. BraytonCycle._update evaluates it with the
+# simulation.thermodynamics relations brayton_cycle_kernel applies, on plain floats.
+# "tau" is the isentropic temperature ratio rp**((gamma - 1)/gamma).
+CYCLE_INPUTS = ("T1", "P1", "pressure_ratio", "T_max", "cp", "gamma", "eta_c", "eta_t")
+CYCLE_GRAPH = {
+    "tau": ("pressure_ratio", "gamma"),
+    "T2": ("T1", "tau", "eta_c"),
+    "P2": ("P1", "pressure_ratio"),
+    "T3": ("T_max",),
+    "P3": ("P2",),
+    "T4": ("T3", "tau", "eta_t"),
+    "P4": ("P1",),
+    "w_compressor": ("cp", "T2", "T1"),
+    "w_turbine": ("cp", "T3", "T4"),
+    "q_in": ("cp", "T3", "T2"),
+    "w_net": ("w_turbine", "w_compressor"),
+    "eta_ideal": ("tau",),
+    "eta_actual": ("w_net", "q_in"),
+}
+
+def _dependents(graph, inputs):
+    # input → every quantity that (transitively) depends on it, e.g. T_max → T3, T4, w_turbine, ...
+    dependents = {}
+    for name in inputs:
+        affected = {name}
+        for quantity, sources in graph.items():   # the graph is listed in evaluation order
+            if affected.intersection(sources):
+                affected.add(quantity)
+        dependents[name] = tuple(quantity for quantity in graph if quantity in affected)
+    return dependents
+
+CYCLE_DEPENDENTS = _dependents(CYCLE_GRAPH, CYCLE_INPUTS)
+# Quantities made stale by each input. Switching `air` changes the whole model; while it is set, any
+# stale quantity re-runs the whole kernel.
+_INVALIDATES = dict(CYCLE_DEPENDENTS, air=tuple(CYCLE_GRAPH))
+
+_relations = None
+
+def _thermodynamics():
+    # simulation.thermodynamics, imported on first evaluation so that importing this module stays
+    # free of NumPy
+    global _relations
+    if _relations is None:
+        from simulation import thermodynamics
+        _relations = thermodynamics
+    return _relations
 
 class BraytonCycle:
-    def __init__(self, T1, P1, pressure_ratio, T_max, cp=1005, gamma=1.4):
-        self.T1 = T1                            # Ambient temperature [K]
-        self.P1 = P1                            # Ambient pressure [Pa]
-        self.pressure_ratio = pressure_ratio    # Compressor pressure ratio (P2/P1)
-        self.T_max = T_max                      # Maximum temperature after combustion [K]
-        self.cp = cp                            # Specific heat of air at constant pressure [J/kg·K]
-        self.gamma = gamma                      # Heat capacity ratio for air
-
-        # Output values (to be calculated)
-        self.T2 = None
-        self.P2 = None
-        self.T3 = None
-        self.P3 = None
-        self.T4 = None
-        self.P4 = None
-        self.w_compressor = None
-        self.w_turbine = None
-        self.w_net = None
-        self.q_in = None
-        self.eta_ideal = None
-        self.eta_actual = None
+    # Inputs live in slots; outputs (cycle.T2, cycle.w_net, ...) are evaluated lazily from
+    # CYCLE_GRAPH and kept until an input they depend on changes.
+    # Changing T_max on an evaluated cycle, for example, recomputes T3, T4, w_turbine, q_in, w_net
+    # and eta_actual only; assigning an input its current value invalidates nothing.
+    # With `air` set (variable properties) any change re-evaluates the whole cycle with the kernel.
+    __slots__ = ("T1", "P1", "pressure_ratio", "T_max", "cp", "gamma", "eta_c", "eta_t", "air",
+                 "_values", "_stale", "_results")
 
-    def run(self):
-        # Stage 1 → 2: Isentropic Compression
-        self.T2 = compressor_exit_temperature(self.T1, self.pressure_ratio, self.gamma)
-        self.P2 = compressor_exit_pressure(self.P1, self.pressure_ratio)
+    def __init__(self, T1, P1, pressure_ratio, T_max, cp=1005, gamma=1.4, eta_c=1.0, eta_t=1.0, air=None):
+        set_input = object.__setattr__         # nothing has been evaluated yet, so nothing to invalidate
+        set_input(self, "_values", {})
+        set_input(self, "_stale", set(CYCLE_GRAPH))
+        set_input(self, "_results", None)
+        set_input(self, "T1", T1)                         # Ambient temperature [K]
+        set_input(self, "P1", P1)                         # Ambient pressure [Pa]
+        set_input(self, "pressure_ratio", pressure_ratio) # Compressor pressure ratio (P2/P1)
+        set_input(self, "T_max", T_max)                   # Maximum temperature after combustion [K]
+        set_input(self, "cp", cp)                         # Specific heat of air at constant pressure [J/kg·K]
+        set_input(self, "gamma", gamma)                   # Heat capacity ratio for air
+        set_input(self, "eta_c", eta_c)                   # Compressor isentropic efficiency (1 = ideal)
+        set_input(self, "eta_t", eta_t)                   # Turbine isentropic efficiency (1 = ideal)
+        set_input(self, "air", air)                       # Optional AirTables (simulation.air_properties); replaces cp/gamma
 
-        # Stage 2 → 3: Heat Addition (constant pressure)
-        self.T3 = self.T_max
-        self.P3 = self.P2
+    def __setattr__(self, name, value):
+        if name in _INVALIDATES and self._values and getattr(self, name) != value:
+            self._stale.update(_INVALIDATES[name])
+            object.__setattr__(self, "_results", None)
+        object.__setattr__(self, name, value)
 
-        # Stage 3 → 4: Isentropic Expansion
-        self.T4 = turbine_exit_temperature(self.T3, self.pressure_ratio, self.gamma)
-        self.P4 = self.P1
+    def __getattr__(self, name):
+        # Only reached for names that are not slots: T2, w_net, ... are evaluated on demand
+        if name in RESULT_FIELDS:
+            self._update()
+            return self._values[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
-        # Work & Heat Calculations
-        self.w_compressor = compressor_work(self.cp, self.T2, self.T1)
-        self.w_turbine = turbine_work(self.cp, self.T3, self.T4)
-        self.q_in = heat_added(self.cp, self.T3, self.T2)
-        self.w_net = self.w_turbine - self.w_compressor
+    def _update(self):
+        # Re-evaluates the stale quantities as straight-line float arithmetic: each one is a single
+        # relation call on the inputs and the quantities before it in the graph
+        stale = self._stale
+        if not stale:
+            return
+        if self.air is not None:
+            self._run_kernel()
+            stale.clear()
+            return
+
+        td = _thermodynamics()
+        values = self._values
+        T1, cp, T3 = self.T1, self.cp, float(self.T_max)
+        if "tau" in stale:
+            values["tau"] = td.isentropic_temperature_ratio(self.pressure_ratio, self.gamma)
+        tau = values["tau"]
+        if "T2" in stale:
+            values["T2"] = td.actual_compressor_exit_temperature(T1, tau, self.eta_c)
+        T2 = values["T2"]
+        if "P2" in stale:
+            values["P2"] = td.compressor_exit_pressure(self.P1, self.pressure_ratio)
+        if "T3" in stale:
+            values["T3"] = T3
+        if "P3" in stale:
+            values["P3"] = float(values["P2"])
+        if "T4" in stale:
+            values["T4"] = td.actual_turbine_exit_temperature(T3, tau, self.eta_t)
+        if "P4" in stale:
+            values["P4"] = float(self.P1)
+        if "w_compressor" in stale:
+            values["w_compressor"] = td.compressor_work(cp, T2, T1)
+        if "w_turbine" in stale:
+            values["w_turbine"] = td.turbine_work(cp, T3, values["T4"])
+        if "q_in" in stale:
+            values["q_in"] = td.heat_added(cp, T3, T2)
+        if "w_net" in stale:
+            values["w_net"] = td.net_work(values["w_turbine"], values["w_compressor"])
+        if "eta_ideal" in stale:
+            values["eta_ideal"] = td.ideal_efficiency(tau)
+        if "eta_actual" in stale:
+            values["eta_actual"] = td.thermal_efficiency(values["w_net"], values["q_in"])
+        profiling.count("cycle.evaluated", len(stale))
+        stale.clear()
+
+    def _run_kernel(self):
+        # Whole cycle in one kernel call (variable properties have no per-quantity graph). It is
+        # imported on first use so that importing this module stays free of NumPy.
+        from simulation.cycle_kernel import brayton_cycle_kernel
+
+        results = brayton_cycle_kernel(self.T1, self.P1, self.pressure_ratio, self.T_max,
+                                       eta_c=self.eta_c, eta_t=self.eta_t, cp=self.cp, gamma=self.gamma,
+                                       air=self.air)
+        self._values.update((field, float(value)) for field, value in results.items())
+        profiling.count("cycle.evaluated", len(results))
+
+    def run(self):
+        # Brings every output up to date; only quantities invalidated since the last run are evaluated
+        with profiling.timed("cycle.run"):
+            self._update()
 
-        # Efficiencies
-        self.eta_ideal = ideal_efficiency(self.pressure_ratio, self.gamma)
-        self.eta_actual = self.w_net / self.q_in if self.q_in != 0 else 0
+    @property
+    def results(self):
+        return self.get_results()
 
     def get_results(self):
-        return {
-            "T2": self.T2,
-            "T3": self.T3,
-            "T4": self.T4,
-            "w_compressor": self.w_compressor,
-            "w_turbine": self.w_turbine,
-            "q_in": self.q_in,
-            "w_net": self.w_net,
-            "eta_ideal": self.eta_ideal,
-            "eta_actual": self.eta_actual
-        }
+        # A CycleResult record (read-only Mapping with the T2 … eta_actual keys) for the current inputs.
+        # Records are never modified afterwards, so they can be kept as snapshots while the cycle changes.
+        if self._results is None:
+            self.run()
+            object.__setattr__(self, "_results", CycleResult.from_arrays(self._values))
+        return self._results
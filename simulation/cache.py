@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from functools import wraps
+
+from simulation.brayton_cycle import BraytonCycle
+
+def quantize(values, decimals=6):
+    # Rounds inputs so that e.g. slider values differing only by float noise share a cache key
+    return tuple(round(float(value), decimals) for value in values)
+
+class LRUCache:
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+def memoize(maxsize=128, decimals=6):
+    # LRU memoization for functions of numeric arguments. Arguments are quantized before both the
+    # lookup and the call, so a cached value is always the one computed for its key.
+    # The cache is exposed as `function.cache`; cached values are shared, so treat them as read-only.
+    def decorator(function):
+        cache = LRUCache(maxsize)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            args = quantize(args, decimals)
+            kwargs = dict(zip(kwargs, quantize(kwargs.values(), decimals)))
+            key = (args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: function(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+class CycleCache(LRUCache):
+    # BraytonCycle results keyed on the quantized input tuple. Misses are evaluated by updating one
+    # persistent BraytonCycle, so a miss that differs from the previous point in one input (a slider
+    # step) only recomputes the quantities depending on that input.
+    def __init__(self, maxsize=256, decimals=6):
+        super().__init__(maxsize)
+        self.decimals = decimals
+        self._cycle = None
+
+    def run(self, T1, P1, pressure_ratio, T_max, cp=1005, gamma=1.4, eta_c=1.0, eta_t=1.0):
+        key = quantize((T1, P1, pressure_ratio, T_max, cp, gamma, eta_c, eta_t), self.decimals)
+        # The cached CycleResult is shared between hits; treat it as read-only
+        return self.get_or_compute(key, lambda: self._evaluate(*key))
+
+    def _evaluate(self, T1, P1, pressure_ratio, T_max, cp, gamma, eta_c, eta_t):
+        if self._cycle is None:
+            self._cycle = BraytonCycle(T1, P1, pressure_ratio, T_max, cp=cp, gamma=gamma, eta_c=eta_c, eta_t=eta_t)
+        else:
+            cycle = self._cycle
+            cycle.T1, cycle.P1, cycle.pressure_ratio, cycle.T_max = T1, P1, pressure_ratio, T_max
+            cycle.cp, cycle.gamma, cycle.eta_c, cycle.eta_t = cp, gamma, eta_c, eta_t
+        return self._cycle.get_results()
@@ -0,0 +1,264 @@
+import argparse
+import itertools
+import os
+import re
+import sys
+import zipfile
+
+import numpy as np
+
+from simulation import profiling
+from simulation.cycle_kernel import RESULT_FIELDS, brayton_cycle_kernel
+
+# Headless batch runner: evaluates case files without importing the GUI (customtkinter/Tk).
+#
+#   python -m simulation.cli cases.csv results.csv
+#   python -m simulation.cli cases.npy results.npy --chunk-size 500000 --variable-properties
+#
+# Cases are read and evaluated chunk by chunk, so memory is bounded by --chunk-size whatever the
+# file size. Inputs: CSV with a header row, .npy (structured array with named fields, or a 2D float
+# array with columns in INPUT_COLUMNS order) or .npz (one array per column). Outputs: CSV, a
+# structured .npy written through a memory map, or a ResultStore directory ending in .store
+# (appended to if it already exists; see simulation.store).
+
+INPUT_COLUMNS = ("T1", "P1", "rp", "Tmax", "eta_c", "eta_t")
+OPTIONAL_COLUMNS = {"eta_c": 1.0, "eta_t": 1.0}
+COLUMN_ALIASES = {"pressure_ratio": "rp", "T_max": "Tmax"}
+
+def _normalize(names):
+    return [COLUMN_ALIASES.get(name.strip(), name.strip()) for name in names]
+
+def _columns_from_table(table, names):
+    columns = dict(zip(names, table.T))
+    missing = [name for name in INPUT_COLUMNS if name not in columns and name not in OPTIONAL_COLUMNS]
+    if missing:
+        raise ValueError(f"Case file is missing column(s): {', '.join(missing)}")
+    return {name: columns.get(name, OPTIONAL_COLUMNS.get(name)) for name in INPUT_COLUMNS}
+
+def read_csv_chunks(path, chunk_size):
+    with open(path) as file:
+        names = _normalize(next(file).split(","))
+        while True:
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines:
+                return
+            lines = [line for line in lines if not line.isspace()]  # np.loadtxt only skips empty ones
+            if not any(not line.startswith("#") for line in lines):
+                continue    # only blank or comment lines, e.g. at the end of the file
+            table = np.loadtxt(lines, delimiter=",", ndmin=2)
+            yield _columns_from_table(table, names)
+
+# Lines read_csv_chunks skips: blank ones (only whitespace) and comments
+_SKIPPED_LINE = re.compile(rb"\n(?:[^\S\n]*|#[^\n]*)(?=\n)")
+_SKIPPED_STARTS = np.frombuffer(b"\n\r\t\f\v #", dtype=np.uint8)
+
+def count_csv_rows(path):
+    # Data rows as read_csv_chunks reads them, i.e. without the header and skipped lines
+    rows = 0
+    tail = b""
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 24), b""):
+            block = tail + block
+            end = block.rfind(b"\n") + 1
+            tail = block[end:]
+            rows += _count_lines(block[:end])
+    rows += _count_lines(tail)  # last line without a newline
+    return max(rows - 1, 0)  # header
+
+def _count_lines(lines):
+    # Lines that are not skipped, in whole lines of text
+    if not lines:
+        return 0
+    if not lines.endswith(b"\n"):
+        lines += b"\n"
+    rows = lines.count(b"\n")
+    lines = b"\n" + lines
+    # Only lines starting with one of _SKIPPED_STARTS can be skipped; clean files skip the regex scan
+    data = np.frombuffer(lines, dtype=np.uint8)
+    if np.isin(data[1:][data[:-1] == ord("\n")], _SKIPPED_STARTS).any():
+        rows -= len(_SKIPPED_LINE.findall(lines))
+    return rows
+
+def _npz_member(archive, path, name):
+    # Uncompressed members are memory-mapped in place; compressed ones have to be read whole
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return np.load(archive.open(name))
+
+    with open(path, "rb") as file:
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = np.frombuffer(file.read(4), dtype="<u2")
+        file.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+def open_array_columns(path):
+    # Column name → array (memory-mapped where possible) and the number of rows
+    if str(path).endswith(".npz"):
+        with zipfile.ZipFile(path) as archive:
+            columns = {_normalize([name[:-4]])[0]: _npz_member(archive, path, name)
+                       for name in archive.namelist() if name.endswith(".npy")}
+    else:
+        array = np.load(path, mmap_mode="r")
+        if array.dtype.names:
+            columns = dict(zip(_normalize(array.dtype.names), (array[name] for name in array.dtype.names)))
+        else:
+            if array.ndim != 2:
+                raise ValueError("Unstructured .npy case files must be 2D (rows × columns).")
+            columns = dict(zip(INPUT_COLUMNS, array.T))
+    rows = len(next(iter(columns.values())))
+    return columns, rows
+
+def read_array_chunks(path, chunk_size):
+    columns, rows = open_array_columns(path)
+    for start in range(0, rows, chunk_size):
+        chunk = {name: np.asarray(values[start:start + chunk_size], dtype=float)
+                 for name, values in columns.items()}
+        missing = [name for name in INPUT_COLUMNS if name not in chunk and name not in OPTIONAL_COLUMNS]
+        if missing:
+            raise ValueError(f"Case file is missing column(s): {', '.join(missing)}")
+        yield {name: chunk.get(name, OPTIONAL_COLUMNS.get(name)) for name in INPUT_COLUMNS}
+
+def evaluate_cases(chunks, cp=1005, gamma=1.4, air=None):
+    for cases in chunks:
+        with profiling.timed("cli.evaluate"):
+            results = brayton_cycle_kernel(cases["T1"], cases["P1"], cases["rp"], cases["Tmax"],
+                                           eta_c=cases["eta_c"], eta_t=cases["eta_t"],
+                                           cp=cp, gamma=gamma, air=air)
+        rows = len(results["T2"])
+        yield {name: np.broadcast_to(cases[name], rows) for name in INPUT_COLUMNS} | results
+
+OUTPUT_COLUMNS = INPUT_COLUMNS + RESULT_FIELDS
+
+class CSVWriter:
+    def __init__(self, path, precision=12):
+        self.file = open(path, "w")
+        self.file.write(",".join(OUTPUT_COLUMNS) + "\n")
+        self.row_format = ",".join([f"%.{precision}g"] * len(OUTPUT_COLUMNS)) + "\n"
+
+    @profiling.profiled("cli.write")
+    def write(self, chunk):
+        # One formatting call per chunk instead of one per row
+        table = np.column_stack([chunk[name] for name in OUTPUT_COLUMNS])
+        self.file.write((self.row_format * len(table)) % tuple(table.ravel().tolist()))
+
+    def close(self):
+        self.file.close()
+
+    def discard(self):
+        self.close()
+
+class NpyWriter:
+    # Structured array with one float64 field per column, filled through a memory map under a
+    # temporary name and only renamed to `path` once every chunk has been written
+    def __init__(self, path, rows):
+        dtype = np.dtype([(name, np.float64) for name in OUTPUT_COLUMNS])
+        self.path = path
+        self.partial_path = f"{path}.partial"
+        self.array = np.lib.format.open_memmap(self.partial_path, mode="w+", dtype=dtype, shape=(rows,))
+        self.position = 0
+
+    @profiling.profiled("cli.write")
+    def write(self, chunk):
+        rows = len(chunk["T2"])
+        block = self.array[self.position:self.position + rows]
+        for name in OUTPUT_COLUMNS:
+            block[name] = chunk[name]
+        self.position += rows
+
+    def close(self):
+        self.array.flush()
+        del self.array
+        os.replace(self.partial_path, self.path)
+
+    def discard(self):
+        del self.array
+        os.remove(self.partial_path)
+
+class StoreWriter:
+    def __init__(self, path):
+        from simulation.store import ResultStore
+        self.store = ResultStore(path, columns=OUTPUT_COLUMNS)
+        if self.store.columns != OUTPUT_COLUMNS:
+            raise ValueError(f"Existing store {path} has different columns.")
+
+    def write(self, chunk):
+        self.store.append(chunk)
+
+    def close(self):
+        pass
+
+    def discard(self):
+        pass    # chunks already appended stay in the store
+
+def run(input_path, output_path, chunk_size=1_000_000, cp=1005, gamma=1.4, air=None):
+    input_path = str(input_path)
+    output_path = str(output_path)
+    if input_path.endswith(".csv"):
+        chunks = read_csv_chunks(input_path, chunk_size)
+        rows = count_csv_rows(input_path) if output_path.endswith(".npy") else None
+    elif input_path.endswith((".npy", ".npz")):
+        chunks = read_array_chunks(input_path, chunk_size)
+        rows = open_array_columns(input_path)[1]
+    else:
+        raise ValueError(f"Unsupported case file type: {input_path}")
+
+    if output_path.endswith(".csv"):
+        writer = CSVWriter(output_path)
+    elif output_path.endswith(".npy"):
+        writer = NpyWriter(output_path, rows)
+    elif output_path.rstrip("/\\").endswith(".store"):
+        writer = StoreWriter(output_path)
+    else:
+        raise ValueError(f"Unsupported result file type: {output_path}")
+
+    written = 0
+    try:
+        for chunk in evaluate_cases(chunks, cp=cp, gamma=gamma, air=air):
+            writer.write(chunk)
+            written += len(chunk["T2"])
+            profiling.count("cli.chunks")
+    except BaseException:
+        writer.discard()
+        raise
+    writer.close()
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate Brayton cycle cases from a file, without the GUI.")
+    parser.add_argument("input", help="Case file (.csv, .npy or .npz)")
+    parser.add_argument("output", help="Result file (.csv or .npy) or result store directory (.store)")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Cases evaluated per batch")
+    parser.add_argument("--cp", type=float, default=1005, help="Specific heat [J/kg·K]")
+    parser.add_argument("--gamma", type=float, default=1.4, help="Heat capacity ratio")
+    parser.add_argument("--variable-properties", action="store_true",
+                        help="Use temperature-dependent air properties instead of constant cp/gamma")
+    parser.add_argument("--profile", metavar="PATH", help="Write stage timings and counters as JSON")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiling.enable()
+
+    air = None
+    if args.variable_properties:
+        from simulation.air_properties import air_tables
+        air = air_tables()
+
+    try:
+        written = run(args.input, args.output, args.chunk_size, args.cp, args.gamma, air)
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    if args.profile:
+        profiling.export(args.profile)
+    print(f"Evaluated {written} cases → {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
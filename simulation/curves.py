@@ -0,0 +1,76 @@
+import numpy as np
+
+from simulation.cache import memoize
+from simulation.cycle_kernel import brayton_cycle_kernel
+
+# Curve data comes from the shared cycle kernel in one array evaluation per curve and is memoized on
+# the (quantized) inputs, so revisiting an operating point or switching back to a plot does not
+# recompute the sweep. The returned arrays are shared.
+@memoize(maxsize=32)
+def efficiency_vs_rp_curve(gamma):
+    rp_vals = np.arange(15, 401) / 10  # From 1.5 to 40 in 0.1 steps
+    eta_vals = brayton_cycle_kernel(288, 101325, rp_vals, 1600, gamma=gamma)["eta_ideal"]
+    return _read_only(rp_vals, eta_vals)
+
+@memoize(maxsize=64)
+def net_work_vs_rp_curve(T1, Tmax, eta_c, eta_t, gamma, cp):
+    rp_range = np.linspace(1.5, 40, 100)
+    net_work = brayton_cycle_kernel(T1, 101325, rp_range, Tmax, eta_c=eta_c, eta_t=eta_t,
+                                    cp=cp, gamma=gamma)["w_net"]
+    return _read_only(rp_range, net_work)
+
+@memoize(maxsize=64)
+def efficiency_vs_Tmax_curve(T1, rp, gamma, eta_c=1.0, eta_t=1.0, cp=1005):
+    T2 = brayton_cycle_kernel(T1, 101325, rp, T1, eta_c=eta_c, gamma=gamma)["T2"]
+    Tmax_range = np.linspace(T2 + 50, 1500, 100)
+    efficiencies = brayton_cycle_kernel(T1, 101325, rp, Tmax_range, eta_c=eta_c, eta_t=eta_t,
+                                        cp=cp, gamma=gamma)["eta_actual"]
+    return _read_only(Tmax_range, efficiencies)
+
+# Cycle process paths 1 → 2 → 3 → 4 → 1, `points` samples per leg:
+#   1 → 2 compression and 3 → 4 expansion as polytropic paths, T ∝ P^((n-1)/n) with the exponent that
+#         joins the end states, so entropy is generated along the leg when eta < 1 (isentropic at eta = 1)
+#   2 → 3 heat addition and 4 → 1 heat rejection at constant pressure
+# Entropy is relative to state 1 [kJ/kg·K], specific volume from the ideal gas law [m³/kg].
+PATH_FIELDS = ("T", "P", "v", "s")
+
+def process_path(T1, P1, pressure_ratio, T2, T3, T4, cp=1005, gamma=1.4, points=100):
+    # Paths for a batch of cycles: each field has shape (*batch, 4 * points), legs one after another
+    # with their end states repeated, so the first sample of each leg is a state point.
+    # Vectorized over both the batch and the samples; there is no loop over either.
+    T1, P1, pressure_ratio, T2, T3, T4 = (np.asarray(value, dtype=float)[..., None, None]
+                                          for value in (T1, P1, pressure_ratio, T2, T3, T4))
+    R = cp * (1 - 1 / gamma)
+    fraction = np.linspace(0, 1, points)
+
+    # log(T/T1) and log(P/P1) at the start of each leg, and their change over the leg
+    ln_T2, ln_T3, ln_T4 = np.log(T2 / T1), np.log(T3 / T1), np.log(T4 / T1)
+    ln_rp = np.log(pressure_ratio)
+    zero = np.zeros_like(ln_T2)
+    ln_T = np.concatenate([zero, ln_T2, ln_T3, ln_T4], axis=-2)
+    ln_T = ln_T + fraction * (np.roll(ln_T, -1, axis=-2) - ln_T)
+    ln_P = np.concatenate([zero, ln_rp + zero, ln_rp + zero, zero], axis=-2)
+    ln_P = ln_P + fraction * (np.roll(ln_P, -1, axis=-2) - ln_P)
+
+    shape = ln_T.shape[:-2] + (4 * points,)
+    T = T1[..., 0] * np.exp(ln_T.reshape(shape))
+    P = P1[..., 0] * np.exp(ln_P.reshape(shape))
+    s = (cp * ln_T - R * ln_P).reshape(shape) / 1000
+    return {"T": T, "P": P, "v": R * T / P, "s": s}
+
+def path_states(points=100):
+    # Indices of the states 1, 2, 3, 4 and 1 (closure) in a process path
+    return np.array([0, points, 2 * points, 3 * points, 4 * points - 1])
+
+@memoize(maxsize=64)
+def cycle_process_path(T1, P1, rp, Tmax, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4, points=100):
+    # Process path of one operating point, read-only
+    results = brayton_cycle_kernel(T1, P1, rp, Tmax, eta_c=eta_c, eta_t=eta_t, cp=cp, gamma=gamma)
+    path = process_path(T1, P1, rp, results["T2"], results["T3"], results["T4"], cp, gamma, int(points))
+    _read_only(*path.values())
+    return path
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
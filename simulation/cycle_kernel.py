@@ -0,0 +1,103 @@
+import numpy as np
+
+from simulation.thermodynamics import (
+    isentropic_temperature_ratio,
+    actual_compressor_exit_temperature,
+    compressor_exit_pressure,
+    actual_turbine_exit_temperature,
+    compressor_work,
+    turbine_work,
+    heat_added,
+    net_work,
+    ideal_efficiency,
+    thermal_efficiency
+)
+from simulation.results import RESULT_FIELDS
+
+# The single implementation of the (non-ideal) Brayton cycle physics. BraytonCycleBatch, the sweeps
+# and the GUI curves evaluate it; BraytonCycle evaluates the same thermodynamics relations one
+# quantity at a time (and this kernel with `air`), and the cycle variants compose them into stages.
+# With eta_c = eta_t = 1 it is the ideal cycle.
+
+def empty_results(shape):
+    # Preallocated output buffers that can be handed to brayton_cycle_kernel(out=...) repeatedly
+    return {field: np.empty(shape) for field in RESULT_FIELDS}
+
+def brayton_cycle_kernel(T1, P1, pressure_ratio, T_max, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4,
+                         air=None, out=None):
+    # All inputs broadcast against each other. `out` is an optional dict of preallocated arrays
+    # (see empty_results) or a ResultSet that is filled in place and returned. With `air` (an AirTables from
+    # simulation.air_properties) temperature-dependent properties replace cp and gamma.
+    # eta_ideal is always the efficiency of the ideal cycle between the same pressures.
+    if out is None:
+        shape = np.broadcast_shapes(*(np.shape(value) for value in
+                                      (T1, P1, pressure_ratio, T_max, eta_c, eta_t, cp, gamma)))
+        out = empty_results(shape)
+    if air is not None:
+        return _variable_property_cycle(T1, P1, pressure_ratio, T_max, eta_c, eta_t, air, out)
+
+    # rp**((gamma - 1)/gamma) is shared by compression, expansion and the ideal efficiency,
+    # so it is computed once into the eta_ideal buffer and converted in place at the end
+    temperature_ratio = isentropic_temperature_ratio(pressure_ratio, gamma, out=out["eta_ideal"])
+
+    # Stage 1 → 2: Compression
+    actual_compressor_exit_temperature(T1, temperature_ratio, eta_c, out=out["T2"])
+    compressor_exit_pressure(P1, pressure_ratio, out=out["P2"])
+
+    # Stage 2 → 3: Heat Addition (constant pressure)
+    np.copyto(out["T3"], T_max)
+    np.copyto(out["P3"], out["P2"])
+
+    # Stage 3 → 4: Expansion
+    actual_turbine_exit_temperature(out["T3"], temperature_ratio, eta_t, out=out["T4"])
+    np.copyto(out["P4"], P1)
+
+    # Work & Heat Calculations
+    compressor_work(cp, out["T2"], T1, out=out["w_compressor"])
+    turbine_work(cp, out["T3"], out["T4"], out=out["w_turbine"])
+    heat_added(cp, out["T3"], out["T2"], out=out["q_in"])
+    net_work(out["w_turbine"], out["w_compressor"], out=out["w_net"])
+
+    # Efficiencies
+    ideal_efficiency(temperature_ratio, out=temperature_ratio)
+    thermal_efficiency(out["w_net"], out["q_in"], out=out["eta_actual"])
+    return out
+
+# Variable-property compression and expansion, shared with simulation.cycle_variants: isentropic
+# exit states from s°(T), component efficiencies applied to enthalpy changes. Both return the inlet,
+# isentropic exit and actual exit enthalpies; actual states are recovered with air.T_from_h.
+def compression_enthalpies(air, T_in, pressure_ratio, eta_c):
+    h_in = air.h(T_in)
+    h_isentropic = air.h(air.isentropic_exit_temperature(T_in, pressure_ratio))
+    return h_in, h_isentropic, h_in + (h_isentropic - h_in) / eta_c
+
+def expansion_enthalpies(air, T_in, pressure_ratio, eta_t):
+    h_in = air.h(T_in)
+    h_isentropic = air.h(air.isentropic_exit_temperature(T_in, 1 / np.asarray(pressure_ratio, dtype=float)))
+    return h_in, h_isentropic, h_in - eta_t * (h_in - h_isentropic)
+
+def _variable_property_cycle(T1, P1, pressure_ratio, T_max, eta_c, eta_t, air, out):
+    # Stage 1 → 2: Compression
+    h1, h2s, h2 = compression_enthalpies(air, T1, pressure_ratio, eta_c)
+    np.copyto(out["T2"], air.T_from_h(h2))
+    compressor_exit_pressure(P1, pressure_ratio, out=out["P2"])
+
+    # Stage 2 → 3: Heat Addition (constant pressure)
+    np.copyto(out["T3"], T_max)
+    np.copyto(out["P3"], out["P2"])
+
+    # Stage 3 → 4: Expansion
+    h3, h4s, h4 = expansion_enthalpies(air, T_max, pressure_ratio, eta_t)
+    np.copyto(out["T4"], air.T_from_h(h4))
+    np.copyto(out["P4"], P1)
+
+    # Work & Heat Calculations
+    np.subtract(h2, h1, out=out["w_compressor"])
+    np.subtract(h3, h4, out=out["w_turbine"])
+    np.subtract(h3, h2, out=out["q_in"])
+    net_work(out["w_turbine"], out["w_compressor"], out=out["w_net"])
+
+    # Efficiencies
+    thermal_efficiency((h3 - h4s) - (h2s - h1), h3 - h2s, out=out["eta_ideal"])
+    thermal_efficiency(out["w_net"], out["q_in"], out=out["eta_actual"])
+    return out
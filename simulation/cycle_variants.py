@@ -0,0 +1,160 @@
+import numpy as np
+
+from simulation.thermodynamics import (
+    isentropic_temperature_ratio,
+    actual_compressor_exit_temperature,
+    compressor_exit_pressure,
+    actual_turbine_exit_temperature,
+    compressor_work,
+    turbine_work,
+    heat_added,
+    ideal_efficiency,
+    thermal_efficiency
+)
+from simulation.cycle_kernel import compression_enthalpies, empty_results, expansion_enthalpies
+
+# Brayton cycle variants assembled from vectorized stages: N-stage intercooled compression,
+# M-stage expansion with reheat, and an optional recuperator. The stages apply the kernel's relations
+# (simulation.thermodynamics, or the variable-property enthalpy relations with `air`) to whole
+# arrays and write into the result buffers; the only Python loops run over the stages, never over
+# operating points.
+#
+#   variant = CycleVariant(compression=Compression(stages=2), expansion=Expansion(stages=2),
+#                          recuperator=Recuperator(0.85))
+#   results = variant.run(T1, P1, rp, Tmax, eta_c, eta_t)
+#   sweep(DesignSpace(T1, P1, rp, Tmax, eta_c, eta_t, variant=variant))
+#
+# The results have the kernel's RESULT_FIELDS, so variants go through sweeps, parallel sweeps and
+# result stores like the simple cycle: T2 and T4 are the last compressor and turbine stage exits,
+# q_in includes reheat and excludes the heat recovered by the recuperator, and eta_ideal is still the
+# ideal simple cycle between the same pressures, for comparison. CycleVariant() is the simple cycle
+# (exactly; to the accuracy of the h(T) table inversion with `air`).
+
+class Compression:
+    # `stages` equal pressure ratio stages (rp**(1/stages) each); between stages an intercooler
+    # cools the air back towards T1 with the given effectiveness (1 = all the way to T1)
+    def __init__(self, stages=1, intercooler_effectiveness=1.0):
+        if stages < 1:
+            raise ValueError("Compression needs at least one stage.")
+        self.stages = int(stages)
+        self.intercooler_effectiveness = intercooler_effectiveness
+
+    def __call__(self, T1, pressure_ratio, eta_c, cp, gamma, air, out):
+        # Fills out = (exit temperature, total work) in place
+        T_out, work = out
+        stage_ratio = np.power(pressure_ratio, 1 / self.stages)
+        if air is None:
+            temperature_ratio = isentropic_temperature_ratio(stage_ratio, gamma)
+        stage_work = work if self.stages == 1 else np.empty_like(work)
+        T_in = T1
+        for stage in range(self.stages):
+            if air is None:
+                actual_compressor_exit_temperature(T_in, temperature_ratio, eta_c, out=T_out)
+                compressor_work(cp, T_out, T_in, out=stage_work)
+            else:
+                h_in, _, h_out = compression_enthalpies(air, T_in, stage_ratio, eta_c)
+                np.copyto(T_out, air.T_from_h(h_out))
+                np.subtract(h_out, h_in, out=stage_work)
+            if stage_work is not work:
+                if stage:
+                    np.add(work, stage_work, out=work)
+                else:
+                    np.copyto(work, stage_work)
+
+            if stage < self.stages - 1:
+                # Intercooler: T_in = T_out - effectiveness (T_out - T1)
+                if T_in is T1:
+                    T_in = np.empty_like(T_out)
+                np.subtract(T1, T_out, out=T_in)
+                np.multiply(T_in, self.intercooler_effectiveness, out=T_in)
+                np.add(T_in, T_out, out=T_in)
+
+class Expansion:
+    # `stages` equal pressure ratio stages; between stages the gas is reheated to T_max
+    def __init__(self, stages=1):
+        if stages < 1:
+            raise ValueError("Expansion needs at least one stage.")
+        self.stages = int(stages)
+
+    def __call__(self, T_max, pressure_ratio, eta_t, cp, gamma, air, out):
+        # Fills out = (exit temperature, total work, reheat heat input) in place. Every stage starts
+        # at T_max with the same pressure ratio, so all stages are alike, and each reheat adds back
+        # exactly the enthalpy drop of the stage before it: one stage is evaluated.
+        T_out, work, reheat = out
+        stage_ratio = np.power(pressure_ratio, 1 / self.stages)
+        if air is None:
+            temperature_ratio = isentropic_temperature_ratio(stage_ratio, gamma)
+            actual_turbine_exit_temperature(T_max, temperature_ratio, eta_t, out=T_out)
+            turbine_work(cp, T_max, T_out, out=work)
+        else:
+            h_in, _, h_out = expansion_enthalpies(air, T_max, stage_ratio, eta_t)
+            np.copyto(T_out, air.T_from_h(h_out))
+            np.subtract(h_in, h_out, out=work)
+        np.multiply(work, self.stages - 1, out=reheat)
+        np.multiply(work, self.stages, out=work)
+
+class Recuperator:
+    # Preheats the compressed air with the turbine exhaust: the burner inlet is
+    # T2 + effectiveness (T4 - T2) (on enthalpies with variable properties), and nothing is recovered
+    # where the exhaust is colder than the compressed air
+    def __init__(self, effectiveness):
+        self.effectiveness = effectiveness
+
+    def __call__(self, T2, T4, air):
+        # Burner inlet temperature
+        if air is None:
+            burner_inlet = np.subtract(T4, T2, out=np.empty_like(T2))
+            np.maximum(burner_inlet, 0, out=burner_inlet)
+            np.multiply(burner_inlet, self.effectiveness, out=burner_inlet)
+            np.add(burner_inlet, T2, out=burner_inlet)
+            return burner_inlet
+        h2 = air.h(T2)
+        return air.T_from_h(h2 + self.effectiveness * np.maximum(air.h(T4) - h2, 0))
+
+class CycleVariant:
+    def __init__(self, compression=None, expansion=None, recuperator=None):
+        self.compression = compression or Compression()
+        self.expansion = expansion or Expansion()
+        self.recuperator = recuperator
+
+    def run(self, T1, P1, pressure_ratio, T_max, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4, air=None, out=None):
+        # Same inputs and outputs as brayton_cycle_kernel, including `out` buffers and `air`
+        if out is None:
+            shape = np.broadcast_shapes(*(np.shape(value) for value in
+                                          (T1, P1, pressure_ratio, T_max, eta_c, eta_t, cp, gamma)))
+            out = empty_results(shape)
+
+        self.compression(T1, pressure_ratio, eta_c, cp, gamma, air, out=(out["T2"], out["w_compressor"]))
+        # q_in collects the reheat first; the burner's heat is added below
+        self.expansion(T_max, pressure_ratio, eta_t, cp, gamma, air, out=(out["T4"], out["w_turbine"], out["q_in"]))
+        burner_inlet = out["T2"] if self.recuperator is None else self.recuperator(out["T2"], out["T4"], air)
+
+        # Burner: heat from the burner inlet to T_max (out["T3"] is scratch until it is set)
+        if air is None:
+            heat_added(cp, T_max, burner_inlet, out=out["T3"])
+        else:
+            np.subtract(air.h(T_max), air.h(burner_inlet), out=out["T3"])
+        np.add(out["q_in"], out["T3"], out=out["q_in"])
+
+        compressor_exit_pressure(P1, pressure_ratio, out=out["P2"])
+        np.copyto(out["T3"], T_max)
+        np.copyto(out["P3"], out["P2"])
+        np.copyto(out["P4"], P1)
+        np.subtract(out["w_turbine"], out["w_compressor"], out=out["w_net"])
+
+        # Efficiencies; eta_ideal as in the kernel
+        if air is None:
+            ideal_efficiency(isentropic_temperature_ratio(pressure_ratio, gamma, out=out["eta_ideal"]),
+                             out=out["eta_ideal"])
+        else:
+            h1, h2s, _ = compression_enthalpies(air, T1, pressure_ratio, 1.0)
+            h3, h4s, _ = expansion_enthalpies(air, T_max, pressure_ratio, 1.0)
+            thermal_efficiency((h3 - h4s) - (h2s - h1), h3 - h2s, out=out["eta_ideal"])
+        thermal_efficiency(out["w_net"], out["q_in"], out=out["eta_actual"])
+        return out
+
+    def __repr__(self):
+        parts = [f"compression={self.compression.stages} stage(s)", f"expansion={self.expansion.stages} stage(s)"]
+        if self.recuperator is not None:
+            parts.append(f"recuperator={self.recuperator.effectiveness}")
+        return f"CycleVariant({', '.join(parts)})"
@@ -0,0 +1,154 @@
+import numpy as np
+
+from simulation.cycle_kernel import brayton_cycle_kernel
+
+# One cycle output over the rp × Tmax design space, as the data behind the heatmap plots.
+# A DesignMap only hands out views at a requested size, so the cost of drawing it depends on the
+# number of pixels, not on the data:
+#   - without `resolution` every view is evaluated on demand for exactly the visible window (as is
+#     exact_view() on any map)
+#   - with resolution=(rows, columns) the whole grid is evaluated once, together with a pyramid of
+#     2 × 2 averaged levels, and views take the visible window from the finest level that is still
+#     at least as fine as the requested size, averaged down in blocks (or strided from the full
+#     grid, for coarse views). A view then reads a few times its own size, whatever the grid size.
+#
+#   design_map = DesignMap("eta_actual", T1=288, eta_c=0.85, eta_t=0.88, resolution=(4096, 4096))
+#   extent, values = design_map.view((5, 20), (1400, 1800), (400, 500))
+#
+# Values are laid out with Tmax along the rows and rp along the columns (image order). Points where
+# no heat is added (T2 ≥ Tmax) are NaN.
+
+DEFAULT_RP_RANGE = (1.5, 40)
+DEFAULT_TMAX_RANGE = (1200, 2000)
+
+class DesignMap:
+    def __init__(self, field, T1, P1=101325, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4,
+                 rp_range=DEFAULT_RP_RANGE, Tmax_range=DEFAULT_TMAX_RANGE, resolution=None):
+        self.field = field
+        self.inputs = {"T1": T1, "P1": P1, "eta_c": eta_c, "eta_t": eta_t, "cp": cp, "gamma": gamma}
+        self.rp_range = tuple(map(float, rp_range))
+        self.Tmax_range = tuple(map(float, Tmax_range))
+        self.values = None
+        self.levels = []
+        if resolution is not None:
+            rows, columns = resolution
+            self.values = self.evaluate(np.linspace(*self.rp_range, columns), np.linspace(*self.Tmax_range, rows))
+            self.levels = pyramid(self.values)
+            for level in self.levels:
+                level.setflags(write=False)
+
+    def evaluate(self, rp, Tmax, rows_per_chunk=128):
+        # The field on the grid rp (columns) × Tmax (rows), a few rows at a time so the kernel's
+        # other outputs never take more than a chunk's worth of memory
+        values = np.empty((len(Tmax), len(rp)))
+        for start in range(0, len(Tmax), rows_per_chunk):
+            stop = min(start + rows_per_chunk, len(Tmax))
+            results = brayton_cycle_kernel(self.inputs["T1"], self.inputs["P1"], rp[None, :],
+                                           Tmax[start:stop, None], eta_c=self.inputs["eta_c"],
+                                           eta_t=self.inputs["eta_t"], cp=self.inputs["cp"],
+                                           gamma=self.inputs["gamma"])
+            np.copyto(values[start:stop], results[self.field])
+            values[start:stop][results["q_in"] <= 0] = np.nan
+        return values
+
+    def view(self, rp_limits, Tmax_limits, shape, coarse=False):
+        # (extent, values) of the window rp_limits × Tmax_limits (clipped to the map) with at most
+        # `shape` = (rows, columns) values; extent is (rp_min, rp_max, Tmax_min, Tmax_max) for imshow
+        if self.values is None:
+            return self.exact_view(rp_limits, Tmax_limits, shape)
+        rp_low, rp_high = np.clip(sorted(rp_limits), *self.rp_range)
+        Tmax_low, Tmax_high = np.clip(sorted(Tmax_limits), *self.Tmax_range)
+        rows, columns = max(int(shape[0]), 1), max(int(shape[1]), 1)
+
+        # Window of the full grid: the nodes inside the limits (at least one)
+        total_rows, total_columns = self.values.shape
+        first_column, last_column = _window(rp_low, rp_high, self.rp_range, total_columns)
+        first_row, last_row = _window(Tmax_low, Tmax_high, self.Tmax_range, total_rows)
+
+        # Level k averages blocks of 2**k × 2**k nodes; take the coarsest one with at least the
+        # requested number of values
+        step = min((last_row - first_row + 1) // rows, (last_column - first_column + 1) // columns)
+        level = 0 if coarse or step < 2 else min(int(np.log2(step)), len(self.levels) - 1)
+        size = 2**level
+        row_cells = _cells(first_row, last_row, size, self.levels[level].shape[0])
+        column_cells = _cells(first_column, last_column, size, self.levels[level].shape[1])
+        window = self.levels[level][row_cells[0]:row_cells[1] + 1, column_cells[0]:column_cells[1] + 1]
+
+        if not coarse and window.shape[0] < 2 * rows and window.shape[1] < 2 * columns:
+            values = window     # less than twice the pixels: left to the image interpolation
+            row_step, column_step, strided = 1, 1, True
+        else:
+            values = downsample(window, (rows, columns), coarse)
+            row_step, column_step, strided = _steps(window.shape, (rows, columns), coarse)
+
+        # Centres of the first and last returned values (a strided value sits on its cell, an
+        # averaged one in the middle of its block), in node indices of the full grid
+        centre = (size - 1) / 2
+        column_offsets = _centres(window.shape[1], column_step, strided)
+        row_offsets = _centres(window.shape[0], row_step, strided)
+        extent = (*(_position((column_cells[0] + offset) * size + centre, self.rp_range, total_columns)
+                    for offset in column_offsets),
+                  *(_position((row_cells[0] + offset) * size + centre, self.Tmax_range, total_rows)
+                    for offset in row_offsets))
+        return extent, values
+
+    def exact_view(self, rp_limits, Tmax_limits, shape):
+        # Like view(), but always evaluated with the kernel at exactly `shape` values over the window,
+        # so zooming in past the grid still gains detail. Costs one kernel evaluation per value.
+        rp_low, rp_high = np.clip(sorted(rp_limits), *self.rp_range)
+        Tmax_low, Tmax_high = np.clip(sorted(Tmax_limits), *self.Tmax_range)
+        rp = np.linspace(rp_low, rp_high, max(int(shape[1]), 1))
+        Tmax = np.linspace(Tmax_low, Tmax_high, max(int(shape[0]), 1))
+        return (rp_low, rp_high, Tmax_low, Tmax_high), self.evaluate(rp, Tmax)
+
+def _window(low, high, limits, nodes):
+    # First and last node index within [low, high]
+    scale = (nodes - 1) / (limits[1] - limits[0]) if nodes > 1 else 0.0
+    first = int(np.ceil((low - limits[0]) * scale - 1e-9))
+    last = int(np.floor((high - limits[0]) * scale + 1e-9))
+    first = min(max(first, 0), nodes - 1)
+    return first, min(max(last, first), nodes - 1)
+
+def _cells(first, last, size, cells):
+    # Cells of `size` nodes covering the nodes first … last (at least one, within the level)
+    first_cell = min(first // size, cells - 1)
+    return first_cell, min(max(last // size, first_cell), cells - 1)
+
+def _centres(cells, step, strided):
+    # Offsets of the first and last value downsample() keeps out of `cells` cells, in cells
+    if strided:
+        return 0, (-(-cells // step) - 1) * step
+    return (step - 1) / 2, (cells // step - 1) * step + (step - 1) / 2
+
+def _position(index, limits, nodes):
+    return limits[0] + (limits[1] - limits[0]) * index / max(nodes - 1, 1)
+
+def pyramid(values, smallest=256):
+    # [values, 2 × 2 block averages, 4 × 4 block averages, ...] down to about `smallest` per side;
+    # all levels together take a third more memory than the grid itself
+    levels = [values]
+    while min(levels[-1].shape) >= 2 * smallest:
+        levels.append(downsample(levels[-1], (levels[-1].shape[0] // 2, levels[-1].shape[1] // 2)))
+    return levels
+
+def downsample(values, shape, coarse=False):
+    # At most shape = (rows, columns) values: averages of whole blocks of the input (NaN where a
+    # block contains a NaN) or, with coarse=True, every k-th value, which only reads what is
+    # returned. Inputs that already fit are returned as they are.
+    row_step, column_step, strided = _steps(values.shape, shape, coarse)
+    if row_step == 1 and column_step == 1:
+        return values
+    if strided:
+        return values[::row_step, ::column_step]
+
+    rows = values.shape[0] // row_step
+    columns = values.shape[1] // column_step
+    blocks = values[:rows * row_step, :columns * column_step].reshape(rows, row_step, columns, column_step)
+    return blocks.mean(axis=(1, 3))
+
+def _steps(size, shape, coarse):
+    # (row_step, column_step, strided) for downsample(): blocks of step values each, strided when
+    # asked to or when the input is thinner than one block
+    row_step = -(-size[0] // shape[0])
+    column_step = -(-size[1] // shape[1])
+    return row_step, column_step, coarse or size[0] < row_step or size[1] < column_step
@@ -0,0 +1,109 @@
+from functools import lru_cache
+
+import numpy as np
+
+from simulation.air_properties import UniformTable
+from simulation.cycle_kernel import empty_results, brayton_cycle_kernel
+
+# International Standard Atmosphere from sea level up to 47 km (the top of the second stratosphere layer)
+G0 = 9.80665                # Standard gravity [m/s²]
+R_ISA = 287.053             # Gas constant used by the ISA [J/kg·K]
+ISA_LAYERS = (
+    # base altitude [m], base temperature [K], base pressure [Pa], lapse rate [K/m]
+    (0.0, 288.15, 101325.0, -0.0065),
+    (11000.0, 216.65, 22632.06, 0.0),
+    (20000.0, 216.65, 5474.889, 0.001),
+    (32000.0, 228.65, 868.0187, 0.0028),
+)
+ISA_CEILING = 47000.0
+
+def isa_atmosphere(altitude):
+    # Exact layer equations; used to build the lookup table
+    altitude = np.asarray(altitude, dtype=float)
+    temperature = np.empty(altitude.shape)
+    pressure = np.empty(altitude.shape)
+    for i, (base, T_base, P_base, lapse) in enumerate(ISA_LAYERS):
+        top = ISA_LAYERS[i + 1][0] if i + 1 < len(ISA_LAYERS) else np.inf
+        layer = (altitude >= base) & (altitude < top) if i else altitude < top
+        height = altitude[layer] - base
+        if lapse == 0:
+            temperature[layer] = T_base
+            pressure[layer] = P_base * np.exp(-G0 * height / (R_ISA * T_base))
+        else:
+            temperature[layer] = T_base + lapse * height
+            pressure[layer] = P_base * (temperature[layer] / T_base) ** (-G0 / (lapse * R_ISA))
+    return temperature, pressure
+
+class ISATable:
+    # ISA temperature and pressure tabulated once on a uniform altitude grid. Pressure is
+    # interpolated in log space, which is exact within the isothermal layer. Altitudes outside
+    # 0 to `ceiling` (at most ISA_CEILING) raise ValueError rather than being extrapolated.
+    def __init__(self, step=1.0, ceiling=ISA_CEILING):
+        if ceiling > ISA_CEILING:
+            raise ValueError(f"The ISA layers end at {ISA_CEILING:g} m.")
+        self.ceiling = ceiling
+        altitude = np.arange(0.0, ceiling + step / 2, step)
+        temperature, pressure = isa_atmosphere(altitude)
+        self.temperature = UniformTable(0.0, step, temperature)
+        self.log_pressure = UniformTable(0.0, step, np.log(pressure))
+
+    def __call__(self, altitude):
+        altitude = np.asarray(altitude, dtype=float)
+        if altitude.size and not (altitude.min() >= 0 and altitude.max() <= self.ceiling):
+            raise ValueError(f"Altitude outside the tabulated ISA range 0-{self.ceiling:g} m.")
+        return self.temperature(altitude), np.exp(self.log_pressure(altitude))
+
+@lru_cache(maxsize=None)
+def isa_table(step=1.0):
+    return ISATable(step)
+
+def ram_recovery(mach):
+    # Inlet total pressure recovery, MIL-E-5008B: 1 up to Mach 1, 1 - 0.075 (M - 1)^1.35 above
+    mach = np.asarray(mach, dtype=float)
+    return 1 - 0.075 * np.clip(mach - 1, 0, None) ** 1.35
+
+def compressor_inlet_conditions(T_ambient, P_ambient, mach, gamma=1.4, inlet_recovery=None):
+    # Stagnation conditions after the inlet; inlet_recovery=None applies ram_recovery(mach)
+    ram = 1 + (gamma - 1) / 2 * np.square(mach)
+    T1 = T_ambient * ram
+    P1 = P_ambient * ram ** (gamma / (gamma - 1))
+    P1 *= ram_recovery(mach) if inlet_recovery is None else inlet_recovery
+    return T1, P1
+
+def mission_chunks(altitude, mach, chunk_size=1_000_000, **schedules):
+    # Splits whole-mission arrays (e.g. np.load(..., mmap_mode="r")) into chunks for
+    # simulate_mission. Extra keyword arrays (T_max, pressure_ratio, ...) are split alongside.
+    for start in range(0, len(altitude), chunk_size):
+        chunk = {"altitude": altitude[start:start + chunk_size], "mach": mach[start:start + chunk_size]}
+        for name, values in schedules.items():
+            chunk[name] = values[start:start + chunk_size]
+        yield chunk
+
+def simulate_mission(chunks, pressure_ratio, T_max, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4,
+                     air=None, inlet_recovery=None, atmosphere=None):
+    # Streams mission samples through atmosphere → inlet → cycle. `chunks` is any iterable of dicts
+    # with "altitude" [m] and "mach" arrays; a chunk may also carry per-sample "pressure_ratio",
+    # "T_max", "eta_c" or "eta_t" schedules that override the scalar arguments.
+    # Yields one dict of columns per chunk. Result buffers are reused between chunks (copy what has
+    # to outlive the next step), so memory depends on the chunk size only, not the mission length.
+    atmosphere = atmosphere or isa_table()
+    design = {"pressure_ratio": pressure_ratio, "T_max": T_max, "eta_c": eta_c, "eta_t": eta_t}
+    buffers = None
+
+    for chunk in chunks:
+        altitude = np.asarray(chunk["altitude"], dtype=float)
+        mach = np.asarray(chunk["mach"], dtype=float)
+        inputs = {name: chunk.get(name, value) for name, value in design.items()}
+
+        T_ambient, P_ambient = atmosphere(altitude)
+        T1, P1 = compressor_inlet_conditions(T_ambient, P_ambient, mach, gamma, inlet_recovery)
+
+        if buffers is None or len(buffers["T2"]) < len(altitude):
+            buffers = empty_results(len(altitude))
+        out = {field: buffer[:len(altitude)] for field, buffer in buffers.items()}
+        results = brayton_cycle_kernel(T1, P1, inputs["pressure_ratio"], inputs["T_max"],
+                                       eta_c=inputs["eta_c"], eta_t=inputs["eta_t"], cp=cp, gamma=gamma,
+                                       air=air, out=out)
+
+        yield {"altitude": altitude, "mach": mach, "T_ambient": T_ambient, "P_ambient": P_ambient,
+               "T1": T1, "P1": P1, **results}
@@ -0,0 +1,305 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulation.cycle_kernel import brayton_cycle_kernel
+from simulation.parallel import shard_ranges
+from simulation.result_set import ResultSet
+
+# Monte Carlo propagation of input scatter (manufacturing tolerances, operating conditions) through
+# the cycle. Inputs are sampled in large chunks straight into reused buffers and every chunk is
+# folded into mergeable running statistics, so memory depends on the chunk size only:
+#
+#   inputs = preset_distributions(presets["Standard Jet"], eta_c=0.01, eta_t=0.01, T1=5, Tmax=15)
+#   summary = monte_carlo(inputs, 10**8, seed=42, workers=8)
+#   summary.mean["eta_actual"], summary.std["eta_actual"], summary.quantile("w_net", [0.05, 0.95])
+#
+# Chunk k always draws from SeedSequence(seed, spawn_key=(k,)), so a run is reproducible for a given
+# seed and chunk size however the chunks are spread over worker processes.
+
+MC_INPUTS = ("T1", "P1", "rp", "Tmax", "eta_c", "eta_t")
+MC_FIELDS = ("T2", "T4", "w_net", "q_in", "eta_actual")
+
+class Normal:
+    # Normal distribution, optionally clipped to [low, high] (e.g. efficiencies ≤ 1)
+    def __init__(self, mean, std, low=None, high=None):
+        self.mean = mean
+        self.std = std
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, out):
+        rng.standard_normal(out=out)
+        out *= self.std
+        out += self.mean
+        if self.low is not None or self.high is not None:
+            np.clip(out, self.low, self.high, out=out)
+        return out
+
+class Uniform:
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, out):
+        rng.random(out=out)
+        out *= self.high - self.low
+        out += self.low
+        return out
+
+class Triangular:
+    def __init__(self, low, mode, high):
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def sample(self, rng, out):
+        # Inverse CDF, computed in place
+        u = rng.random(out=out)
+        split = (self.mode - self.low) / (self.high - self.low)
+        lower = u < split
+        width = self.high - self.low
+        out[lower] = self.low + np.sqrt(u[lower] * width * (self.mode - self.low))
+        out[~lower] = self.high - np.sqrt((1 - u[~lower]) * width * (self.high - self.mode))
+        return out
+
+def preset_distributions(preset, **scatter):
+    # Normal scatter around a JetEngineApp preset: preset_distributions(preset, eta_c=0.01, Tmax=15)
+    # gives eta_c ~ N(preset eta_c, 0.01), Tmax ~ N(preset Tmax, 15); other inputs stay fixed.
+    # Efficiencies are clipped to (0, 1].
+    distributions = dict(preset)
+    for name, std in scatter.items():
+        bounds = (1e-6, 1.0) if name.startswith("eta") else (None, None)
+        distributions[name] = Normal(preset[name], std, *bounds)
+    return distributions
+
+class RunningMoments:
+    # Count, mean, M2 (sum of squared deviations), min and max of one or more columns, updated
+    # per chunk and merged with Chan et al.'s pairwise formula, which stays accurate for any number
+    # of samples (unlike accumulating sums of squares)
+    def __init__(self, columns=1):
+        self.count = 0
+        self.mean = np.zeros(columns)
+        self.m2 = np.zeros(columns)
+        self.minimum = np.full(columns, np.inf)
+        self.maximum = np.full(columns, -np.inf)
+
+    def update(self, columns):
+        # columns: one 1D array of equal length per column
+        other = RunningMoments(len(columns))
+        other.count = len(columns[0])
+        if other.count == 0:
+            return self
+        for i, values in enumerate(columns):
+            other.mean[i] = values.mean()
+            deviation = values - other.mean[i]
+            other.m2[i] = np.dot(deviation, deviation)
+            other.minimum[i] = values.min()
+            other.maximum[i] = values.max()
+        return self.merge(other)
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta**2 * (self.count * other.count / count)
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.full_like(self.m2, np.nan)
+
+class QuantileSketch:
+    # Mergeable quantile sketch with relative error guarantee (DDSketch, Masson et al. 2019): a
+    # value x is counted in bucket ceil(log_g |x|) with g = (1 + a)/(1 - a), so every quantile is
+    # returned within a relative error `a`. Buckets only cover the range actually seen (a few
+    # thousand for a = 1e-3), and merging adds counts, so the result does not depend on how the
+    # samples were split over chunks or processes.
+    def __init__(self, relative_accuracy=1e-3):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.count = 0
+        self.zeros = 0
+        self.positive = _Buckets()
+        self.negative = _Buckets()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        positive = values > 0
+        negative = values < 0
+        self.zeros += len(values) - np.count_nonzero(positive) - np.count_nonzero(negative)
+        self.positive.add(self._index(values[positive]))
+        self.negative.add(self._index(-values[negative]))
+        return self
+
+    def _index(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        self.count += other.count
+        self.zeros += other.zeros
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        return self
+
+    def quantile(self, q):
+        # Values at quantiles q (scalar or array, 0 ≤ q ≤ 1)
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        # Buckets in ascending value order: negatives (largest magnitude first), zero, positives
+        negative_index = self.negative.indices()[::-1]
+        positive_index = self.positive.indices()
+        values = np.concatenate((-self._value(negative_index), [0.0], self._value(positive_index)))
+        counts = np.concatenate((self.negative.counts()[::-1], [self.zeros], self.positive.counts()))
+        rank = q * (self.count - 1)
+        return values[np.searchsorted(np.cumsum(counts), rank, side="right")]
+
+    def _value(self, index):
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+class _Buckets:
+    # Dense counts for a contiguous range of bucket indices, grown as new indices appear
+    def __init__(self):
+        self.offset = 0
+        self.values = np.zeros(0, dtype=np.int64)
+
+    def add(self, index):
+        if len(index) == 0:
+            return
+        self._cover(index.min(), index.max())
+        self.values += np.bincount(index - self.offset, minlength=len(self.values))
+
+    def merge(self, other):
+        if len(other.values):
+            self._cover(other.offset, other.offset + len(other.values) - 1)
+            start = other.offset - self.offset
+            self.values[start:start + len(other.values)] += other.values
+
+    def _cover(self, low, high):
+        if len(self.values) == 0:
+            self.offset = int(low)
+            self.values = np.zeros(int(high - low) + 1, dtype=np.int64)
+            return
+        before = max(0, self.offset - int(low))
+        after = max(0, int(high) - (self.offset + len(self.values) - 1))
+        if before or after:
+            self.values = np.pad(self.values, (before, after))
+            self.offset -= before
+
+    def indices(self):
+        nonzero = np.flatnonzero(self.values)
+        return nonzero + self.offset
+
+    def counts(self):
+        return self.values[self.values > 0]
+
+class MonteCarloSummary:
+    # Mergeable statistics of the MC_FIELDS (or chosen fields) of all samples seen so far
+    def __init__(self, fields=MC_FIELDS, relative_accuracy=1e-3):
+        self.fields = tuple(fields)
+        self.moments = RunningMoments(len(self.fields))
+        self.sketches = {field: QuantileSketch(relative_accuracy) for field in self.fields}
+        self.seed = None    # set by monte_carlo()
+
+    def update(self, results):
+        self.moments.update([np.ravel(results[field]) for field in self.fields])
+        for field in self.fields:
+            self.sketches[field].update(results[field])
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        for field in self.fields:
+            self.sketches[field].merge(other.sketches[field])
+        return self
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    @property
+    def mean(self):
+        return dict(zip(self.fields, self.moments.mean))
+
+    @property
+    def std(self):
+        return dict(zip(self.fields, np.sqrt(self.moments.variance)))
+
+    def quantile(self, field, q):
+        return self.sketches[field].quantile(q)
+
+    def as_dict(self, quantiles=(0.05, 0.5, 0.95)):
+        report = {}
+        for i, field in enumerate(self.fields):
+            report[field] = {
+                "mean": float(self.moments.mean[i]),
+                "std": float(np.sqrt(self.moments.variance[i])),
+                "min": float(self.moments.minimum[i]),
+                "max": float(self.moments.maximum[i]),
+                **{f"p{100 * q:g}": float(self.quantile(field, q)) for q in quantiles}
+            }
+        return {"samples": self.count, "fields": report}
+
+def _chunk_rng(seed, chunk):
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(chunk,))))
+
+def _run_chunks(distributions, samples, chunk_size, seed, first_chunk, last_chunk, fields,
+                relative_accuracy, cp, gamma):
+    # Evaluates chunks [first_chunk, last_chunk) into one summary; also the worker entry point
+    summary = MonteCarloSummary(fields, relative_accuracy)
+    size = min(chunk_size, samples)
+    inputs = ResultSet.empty(size, MC_INPUTS)
+    results = ResultSet.empty(size)
+    for chunk in range(first_chunk, last_chunk):
+        n = min(chunk_size, samples - chunk * chunk_size)
+        rng = _chunk_rng(seed, chunk)
+        sampled = inputs if n == size else inputs[:n]
+        out = results if n == size else results[:n]
+        for name in MC_INPUTS:
+            distribution = distributions.get(name, 1.0)   # unspecified efficiencies: ideal
+            if hasattr(distribution, "sample"):
+                distribution.sample(rng, sampled[name])
+            else:
+                sampled[name][...] = distribution
+        brayton_cycle_kernel(sampled["T1"], sampled["P1"], sampled["rp"], sampled["Tmax"],
+                             eta_c=sampled["eta_c"], eta_t=sampled["eta_t"], cp=cp, gamma=gamma, out=out)
+        summary.update(out)
+    return summary
+
+def monte_carlo(distributions, samples, seed=None, chunk_size=1_000_000, workers=1, fields=MC_FIELDS,
+                relative_accuracy=1e-3, cp=1005, gamma=1.4):
+    # `distributions` maps the MC_INPUTS to a distribution (Normal, Uniform, Triangular, or any
+    # object with sample(rng, out)) or a fixed number. Returns a MonteCarloSummary.
+    # seed=None draws fresh entropy; the seed actually used is stored on the summary.
+    missing = [name for name in ("T1", "P1", "rp", "Tmax") if name not in distributions]
+    if missing:
+        raise ValueError(f"No value or distribution for: {', '.join(missing)}")
+    seed = np.random.SeedSequence(seed).entropy
+    chunks = -(-samples // chunk_size)
+    arguments = (distributions, samples, chunk_size, seed)
+    options = (fields, relative_accuracy, cp, gamma)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or chunks == 1:
+        summary = _run_chunks(*arguments, 0, chunks, *options)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_chunks, *arguments, first, last, *options)
+                       for first, last in shard_ranges(chunks, workers)]
+            summary = MonteCarloSummary(fields, relative_accuracy)
+            for future in futures:
+                summary.merge(future.result())
+    summary.seed = seed
+    return summary
@@ -0,0 +1,96 @@
+import numpy as np
+
+from simulation.cycle_kernel import brayton_cycle_kernel
+
+# Optimum compressor pressure ratios of the non-ideal constant-property cycle for whole arrays of
+# operating conditions. Both objectives are written in terms of the isentropic temperature ratio
+# x = rp**((gamma - 1)/gamma), with a = Tmax·eta_t, b = T1/eta_c and c = Tmax - T1 + b:
+#   w_net / cp = a (1 - 1/x) - b (x - 1)      q_in / cp = c - b x
+# dw/dx = 0 gives x = sqrt(a/b) directly. For the efficiency, d(w/q)/dx has the sign of
+#   N(x) = a c - 2 a b x + b (a + b - c) x²
+# whose root is found by a vectorized bracketed Newton iteration.
+
+def _coefficients(T1, Tmax, eta_c, eta_t):
+    a = Tmax * eta_t
+    b = T1 / eta_c
+    c = Tmax - T1 + b
+    return a, b, c
+
+def _bracketed_newton(f, df, lower, upper, tolerance, max_iterations):
+    # Root of f in [lower, upper] for every element, assuming f(lower) > 0 > f(upper).
+    # Newton steps that leave the current bracket are replaced by bisection.
+    x = (lower + upper) / 2
+    for _ in range(max_iterations):
+        fx = f(x)
+        positive = fx > 0
+        lower = np.where(positive, x, lower)
+        upper = np.where(positive, upper, x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = x - fx / df(x)
+        inside = (newton > lower) & (newton < upper)
+        x_next = np.where(inside, newton, (lower + upper) / 2)
+
+        converged = np.abs(x_next - x) <= tolerance * x
+        x = x_next
+        if converged.all():
+            break
+    return x
+
+def optimum_pressure_ratio(T1, Tmax, eta_c=1.0, eta_t=1.0, gamma=1.4, cp=1005,
+                           rp_min=1.0, rp_max=100.0, tolerance=1e-12, max_iterations=60):
+    # Pressure ratios maximizing net work and thermal efficiency for each (broadcast) combination of
+    # inputs, limited to [rp_min, rp_max] and to T2 < Tmax.
+    T1, Tmax, eta_c, eta_t, gamma, cp = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in
+                                                              (T1, Tmax, eta_c, eta_t, gamma, cp)))
+    exponent = (gamma - 1) / gamma
+    a, b, c = _coefficients(T1, Tmax, eta_c, eta_t)
+
+    x_min = np.asarray(rp_min, dtype=float) ** exponent
+    x_max = np.minimum(np.asarray(rp_max, dtype=float) ** exponent, c / b)
+
+    # Maximum net work
+    x_work = np.clip(np.sqrt(a / b), x_min, x_max)
+
+    # Maximum efficiency: N decreases through its root, so the optimum is interior only where
+    # N changes sign over the bracket; otherwise it sits on the nearer bound
+    quadratic = b * (a + b - c)
+    N = lambda x: a * c - 2 * a * b * x + quadratic * x**2
+    dN = lambda x: -2 * a * b + 2 * quadratic * x
+    rising_at_min = N(x_min) > 0
+    rising_at_max = N(x_max) > 0
+    interior = rising_at_min & ~rising_at_max
+    x_efficiency = np.where(rising_at_max, x_max, x_min)
+    if interior.any():
+        lower = np.broadcast_to(x_min, x_max.shape)
+        x_efficiency = np.where(interior,
+                                _bracketed_newton(N, dN, lower, x_max, tolerance, max_iterations),
+                                x_efficiency)
+
+    rp_work = x_work ** (1 / exponent)
+    rp_efficiency = x_efficiency ** (1 / exponent)
+    at_max_work = brayton_cycle_kernel(T1, 101325, rp_work, Tmax, eta_c, eta_t, cp, gamma)
+    at_max_efficiency = brayton_cycle_kernel(T1, 101325, rp_efficiency, Tmax, eta_c, eta_t, cp, gamma)
+    return {
+        "rp_max_work": rp_work,
+        "w_net_max": at_max_work["w_net"],
+        "eta_at_max_work": at_max_work["eta_actual"],
+        "rp_max_efficiency": rp_efficiency,
+        "eta_max": at_max_efficiency["eta_actual"],
+        "w_net_at_max_efficiency": at_max_efficiency["w_net"]
+    }
+
+def pareto_front(T1, Tmax, eta_c=1.0, eta_t=1.0, gamma=1.4, cp=1005, points=50, **bounds):
+    # Efficiency / specific-work trade-off for each operating condition. Both objectives are unimodal
+    # in rp, so the non-dominated designs are exactly the pressure ratios between the two optima.
+    # Returns arrays with a trailing axis of `points` designs, ordered from max work to max efficiency.
+    optimum = optimum_pressure_ratio(T1, Tmax, eta_c, eta_t, gamma, cp, **bounds)
+    fraction = np.linspace(0, 1, points)
+    log_rp_work = np.log(optimum["rp_max_work"])[..., None]
+    log_rp_efficiency = np.log(optimum["rp_max_efficiency"])[..., None]
+    rp = np.exp(log_rp_work + fraction * (log_rp_efficiency - log_rp_work))
+
+    expand = lambda value: np.asarray(value, dtype=float)[..., None]
+    front = brayton_cycle_kernel(expand(T1), 101325, rp, expand(Tmax), expand(eta_c), expand(eta_t),
+                                 expand(cp), expand(gamma))
+    return {"rp": rp, "w_net": front["w_net"], "eta_actual": front["eta_actual"]}
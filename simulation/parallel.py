@@ -0,0 +1,112 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from simulation.cycle_kernel import RESULT_FIELDS
+from simulation.result_set import ResultSet
+from simulation.sweep import SWEEP_AXES, DEFAULT_MAX_MEMORY, chunk_size_for
+
+COLUMNS = SWEEP_AXES + RESULT_FIELDS
+
+class SharedSweepResults:
+    # Sweep results living in one shared-memory block, one row per column.
+    # Use as a context manager (or call close()) to release the block; copy columns that must outlive it.
+    def __init__(self, size):
+        self.size = size
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * len(COLUMNS) * size))
+        self._table = np.ndarray((len(COLUMNS), size), dtype=np.float64, buffer=self._shm.buf)
+        self.columns = {name: self._table[i] for i, name in enumerate(COLUMNS)}
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.columns = {}
+        self._table = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _evaluate_shard(shm_name, space, start, stop, chunk_size):
+    # Runs in a worker: attaches to the parent's block and writes the shard's rows in place
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = np.ndarray((len(COLUMNS), space.size), dtype=np.float64, buffer=shm.buf)
+        _evaluate_into(table, space, start, stop, chunk_size)
+        del table
+    finally:
+        shm.close()
+    return stop - start
+
+def _evaluate_into(table, space, start, stop, chunk_size):
+    rows = dict(zip(COLUMNS, table))
+    results = ResultSet(table[len(SWEEP_AXES):], RESULT_FIELDS)
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        out = results[chunk_start:chunk_stop]
+        chunk = space.evaluate(chunk_start, chunk_stop, out=out)
+        for axis in SWEEP_AXES:
+            rows[axis][chunk_start:chunk_stop] = chunk[axis]
+
+def shard_ranges(size, shards):
+    bounds = np.linspace(0, size, shards + 1).astype(np.int64)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+def parallel_sweep(space, workers=None, max_memory=DEFAULT_MAX_MEMORY, shards_per_worker=4):
+    # Evaluates the whole design space across a process pool. Each worker evaluates its shard in
+    # memory-bounded chunks (max_memory is per worker) and writes straight into shared memory,
+    # so nothing is pickled back except the row counts.
+    # Results are bit-identical to sweep(): the same kernels run on the same points.
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size_for(max_memory)
+    results = SharedSweepResults(space.size)
+    try:
+        if workers == 1:
+            _evaluate_into(results._table, space, 0, space.size, chunk_size)
+            return results
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_evaluate_shard, results.name, space, start, stop, chunk_size)
+                       for start, stop in shard_ranges(space.size, workers * shards_per_worker)]
+            evaluated = sum(future.result() for future in futures)
+        if evaluated != space.size:
+            raise RuntimeError(f"Parallel sweep evaluated {evaluated} of {space.size} points.")
+        return results
+    except BaseException:
+        results.close()
+        raise
+
+def measure_scaling(space, worker_counts=None, max_memory=DEFAULT_MAX_MEMORY):
+    # Wall-clock time of parallel_sweep for each worker count, with speedup and parallel
+    # efficiency relative to one worker
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({1, *(2**i for i in range(cores.bit_length()) if 2**i <= cores), cores})
+
+    report = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        parallel_sweep(space, workers=workers, max_memory=max_memory).close()
+        seconds = time.perf_counter() - start
+        report.append({"workers": workers, "seconds": seconds})
+
+    baseline = report[0]["seconds"] * report[0]["workers"]
+    for entry in report:
+        entry["speedup"] = baseline / entry["seconds"]
+        entry["efficiency"] = entry["speedup"] / entry["workers"]
+    return report
@@ -0,0 +1,159 @@
+import _thread
+import atexit
+import os
+from time import perf_counter
+
+# Lightweight stage instrumentation: named timers (with a per-call histogram) and counters.
+# Disabled by default; while disabled, timed() hands back a shared no-op context manager and
+# profiled() functions make one flag check, so the hooks can stay in the hot paths.
+#
+#   from simulation import profiling
+#   profiling.enable()
+#   with profiling.timed("simulate.process_path"):
+#       ...
+#   profiling.count("worker.coalesced")
+#   print(profiling.summary()); profiling.export("profile.json")
+#
+# Setting JETENGINE_PROFILE=1 in the environment enables it at import; JETENGINE_PROFILE=<file>.json
+# also writes the report to that file when the process exits.
+# Histogram bucket i counts calls that took [2**(i-1), 2**i) µs (bucket 0: under 1 µs).
+# Only builtin modules are imported, since BraytonCycle imports this and has a 50 ms import budget
+# (benchmarks/import_budget.py); functools/threading/contextlib alone would cost ~8 ms.
+
+_enabled = os.environ.get("JETENGINE_PROFILE", "") not in ("", "0")
+_lock = _thread.allocate_lock()
+_timers = {}
+_counters = {}
+
+class TimerStats:
+    __slots__ = ("calls", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+        self.buckets = []
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        bucket = int(seconds * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls,
+            "min": self.minimum,
+            "max": self.maximum,
+            "histogram": [{"upper_us": 2 ** bucket, "count": count}
+                          for bucket, count in enumerate(self.buckets) if count]
+        }
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+_DISABLED = _NullTimer()
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, perf_counter() - self.start)
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+def record(name, seconds):
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            stats = _timers[name] = TimerStats()
+        stats.add(seconds)
+
+def timed(name):
+    # Context manager timing the enclosed block under `name`
+    if not _enabled:
+        return _DISABLED
+    return _Timer(name)
+
+def profiled(name):
+    # Decorator timing every call of the function under `name`
+    def decorator(function):
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - start)
+        wrapper.__name__ = function.__name__
+        wrapper.__qualname__ = function.__qualname__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__wrapped__ = function
+        return wrapper
+    return decorator
+
+def count(name, n=1):
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+def report():
+    with _lock:
+        return {
+            "enabled": _enabled,
+            "timers": {name: stats.as_dict() for name, stats in sorted(_timers.items())},
+            "counters": dict(sorted(_counters.items()))
+        }
+
+def export(path):
+    import json  # only needed here; keeps the import of this module (and BraytonCycle's) cheap
+    with open(path, "w") as file:
+        json.dump(report(), file, indent=2)
+
+def summary():
+    # Compact text for the GUI output box: calls, mean and max per timer [ms], then the counters
+    data = report()
+    lines = ["Profile (calls / mean / max ms):"]
+    for name, stats in data["timers"].items():
+        lines.append(f"{name}: {stats['calls']} / {stats['mean'] * 1000:.2f} / {stats['max'] * 1000:.2f}")
+    for name, value in data["counters"].items():
+        lines.append(f"{name}: {value}")
+    return "\n".join(lines) + "\n"
+
+if os.environ.get("JETENGINE_PROFILE", "").endswith(".json"):
+    atexit.register(export, os.environ["JETENGINE_PROFILE"])
@@ -0,0 +1,75 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from simulation.results import RESULT_FIELDS, CycleResult
+
+class ResultSet(Mapping):
+    # Columnar results for many operating points: one contiguous float64 block of shape
+    # (len(fields), *shape), so a point costs exactly 8 bytes per field. Indexing by field name
+    # returns a zero-copy view of that column, which also makes a ResultSet usable directly as the
+    # `out` buffers of brayton_cycle_kernel. Indexing with anything else selects points: slices give
+    # views, index arrays and masks give copies.
+    def __init__(self, table, fields=RESULT_FIELDS):
+        self.fields = tuple(fields)
+        if len(table) != len(self.fields):
+            raise ValueError(f"Expected {len(self.fields)} columns, got {len(table)}.")
+        self.table = table
+        self._index = {field: i for i, field in enumerate(self.fields)}
+
+    @classmethod
+    def empty(cls, shape, fields=RESULT_FIELDS):
+        shape = (shape,) if np.ndim(shape) == 0 else tuple(shape)
+        return cls(np.empty((len(fields),) + shape), fields)
+
+    @classmethod
+    def from_columns(cls, columns, fields=None):
+        # Copies a mapping of equally shaped arrays (e.g. a kernel result dict) into one block
+        fields = tuple(columns) if fields is None else tuple(fields)
+        shape = np.broadcast_shapes(*(np.shape(columns[field]) for field in fields))
+        result_set = cls.empty(shape, fields)
+        for field in fields:
+            np.copyto(result_set[field], columns[field])
+        return result_set
+
+    @property
+    def shape(self):
+        return self.table.shape[1:]
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.table[self._index[key], ...]   # stays a (0-d) array view for scalar batches
+        key = key if isinstance(key, tuple) else (key,)
+        return ResultSet(self.table[(slice(None),) + key], self.fields)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def record(self, index):
+        # One point as a CycleResult (requires all RESULT_FIELDS to be present)
+        values = self.table[(slice(None),) + (index if isinstance(index, tuple) else (index,))]
+        return CycleResult.from_arrays(dict(zip(self.fields, values.tolist())))
+
+    def to_records(self):
+        # Copy as a structured array (one float64 field per column), e.g. for np.save
+        records = np.empty(self.shape, dtype=[(field, np.float64) for field in self.fields])
+        for field in self.fields:
+            records[field] = self[field]
+        return records
+
+    def __repr__(self):
+        return f"ResultSet(shape={self.shape}, fields={self.fields})"
@@ -0,0 +1,70 @@
+# Result records for single operating points. Kept free of NumPy (and of collections, ~2.5 ms) so
+# that BraytonCycle can use it within its import budget; the columnar ResultSet lives in
+# simulation.result_set.
+
+RESULT_FIELDS = ("T2", "T3", "T4", "P2", "P3", "P4", "w_compressor", "w_turbine",
+                 "q_in", "w_net", "eta_ideal", "eta_actual")
+
+# Keys of BraytonCycle.get_results() as a mapping (and shown in the GUI); the pressures are
+# attributes of the record only (record.P2)
+CYCLE_RESULT_KEYS = ("T2", "T3", "T4", "w_compressor", "w_turbine", "q_in", "w_net", "eta_ideal", "eta_actual")
+
+class CycleResult:
+    # One evaluated operating point: one slot per result field and no per-instance dict.
+    # Read-only mapping interface over CYCLE_RESULT_KEYS, so it can stand in for the old
+    # get_results() dict (items(), [key], dict(record), ...).
+    __slots__ = RESULT_FIELDS
+
+    def __init__(self, **values):
+        for field in RESULT_FIELDS:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_arrays(cls, results):
+        # From the kernel's 0-d output arrays (or any mapping of field → number)
+        record = cls.__new__(cls)
+        for field in RESULT_FIELDS:
+            setattr(record, field, float(results[field]))
+        return record
+
+    def __getitem__(self, key):
+        if key not in CYCLE_RESULT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(CYCLE_RESULT_KEYS)
+
+    def __len__(self):
+        return len(CYCLE_RESULT_KEYS)
+
+    def __contains__(self, key):
+        return key in CYCLE_RESULT_KEYS
+
+    def keys(self):
+        return CYCLE_RESULT_KEYS
+
+    def values(self):
+        return [getattr(self, key) for key in CYCLE_RESULT_KEYS]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in CYCLE_RESULT_KEYS]
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in CYCLE_RESULT_KEYS else default
+
+    def __eq__(self, other):
+        # Records compare on every field; other mappings on the mapping keys
+        if isinstance(other, CycleResult):
+            return all(getattr(self, field) == getattr(other, field) for field in RESULT_FIELDS)
+        if not hasattr(other, "items"):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    __hash__ = None
+
+    def as_dict(self, fields=RESULT_FIELDS):
+        return {field: getattr(self, field) for field in fields}
+
+    def __repr__(self):
+        return f"CycleResult({', '.join(f'{key}={getattr(self, key)!r}' for key in RESULT_FIELDS)})"
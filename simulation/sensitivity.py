@@ -0,0 +1,110 @@
+import numpy as np
+
+from simulation.cycle_kernel import brayton_cycle_kernel
+from simulation.result_set import ResultSet
+
+# Exact first derivatives of the constant-property cycle for whole batches, in one pass after the
+# primal evaluation (no finite differences). The kernel relations are differentiated in forward
+# mode, with tau = rp**k, k = (gamma - 1)/gamma:
+#   dtau/drp = k tau / rp                 dtau/dgamma = tau ln(rp) / gamma²
+#   T2 = T1 (1 + (tau - 1)/eta_c)         T4 = Tmax (1 - eta_t (1 - 1/tau))
+#   w_net = cp (Tmax - T4 - T2 + T1)      q_in = cp (Tmax - T2)      eta = w_net / q_in
+# so dw = cp (dTmax - dT4 - dT2 + dT1), dq = cp (dTmax - dT2) and deta = (dw - eta dq) / q_in,
+# plus the cp terms w_net/cp and q_in/cp.
+#
+#   results, jacobian = cycle_jacobian(T1, 101325, rp, Tmax, eta_c, eta_t)
+#   jacobian["w_net", "Tmax"]        # dw_net/dTmax for every point
+#   jacobian["eta_actual"]           # ResultSet of deta/d(T1, rp, Tmax, ...)
+
+SENSITIVITY_INPUTS = ("T1", "rp", "Tmax", "eta_c", "eta_t", "cp", "gamma")
+SENSITIVITY_OUTPUTS = ("T2", "T4", "w_net", "q_in", "eta_actual")
+
+class CycleJacobian:
+    # table[i, j, ...] = d SENSITIVITY_OUTPUTS[i] / d SENSITIVITY_INPUTS[j] for every point
+    def __init__(self, table, results, point):
+        self.table = table
+        self.results = results      # ResultSet of the primal evaluation
+        self.point = point          # input name → (broadcast) input array
+        self._outputs = {output: i for i, output in enumerate(SENSITIVITY_OUTPUTS)}
+        self._inputs = {name: j for j, name in enumerate(SENSITIVITY_INPUTS)}
+
+    @property
+    def shape(self):
+        return self.table.shape[2:]
+
+    def __getitem__(self, key):
+        # "w_net" → ResultSet of its derivatives by input; ("w_net", "Tmax") → one derivative array
+        if isinstance(key, str):
+            return ResultSet(self.table[self._outputs[key]], SENSITIVITY_INPUTS)
+        output, name = key
+        return self.table[self._outputs[output], self._inputs[name], ...]
+
+    def elasticity(self, output, name):
+        # Relative sensitivity (dy/y)/(dx/x): the % change in `output` per % change in `name`
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self[output, name] * self.point[name] / self.results[output]
+
+    def linear_std(self, std):
+        # First-order standard deviation of every output for independent input scatter,
+        # std = {"eta_c": 0.01, "Tmax": 15, ...}; a cheap counterpart to simulation.monte_carlo
+        variance = np.zeros((len(SENSITIVITY_OUTPUTS),) + self.shape)
+        for name, sigma in std.items():
+            variance += np.square(self.table[:, self._inputs[name]] * sigma)
+        return dict(zip(SENSITIVITY_OUTPUTS, np.sqrt(variance)))
+
+def cycle_jacobian(T1, P1, pressure_ratio, T_max, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4):
+    # Primal results (ResultSet) and the CycleJacobian for every (broadcast) combination of inputs.
+    # P1 only scales the pressures, so it is not a sensitivity input.
+    T1, pressure_ratio, T_max, eta_c, eta_t, cp, gamma = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (T1, pressure_ratio, T_max, eta_c, eta_t, cp, gamma)))
+    shape = T1.shape
+    results = brayton_cycle_kernel(T1, P1, pressure_ratio, T_max, eta_c=eta_c, eta_t=eta_t, cp=cp, gamma=gamma,
+                                   out=ResultSet.empty(shape))
+    T2, T4, w_net, q_in, eta = (results[field] for field in SENSITIVITY_OUTPUTS)
+    iT1, irp, iTmax, ieta_c, ieta_t, icp, igamma = range(len(SENSITIVITY_INPUTS))
+
+    exponent = (gamma - 1) / gamma
+    tau = pressure_ratio ** exponent
+    dtau_drp = exponent * tau / pressure_ratio
+    dtau_dgamma = tau * np.log(pressure_ratio) / gamma**2
+
+    table = np.zeros((len(SENSITIVITY_OUTPUTS), len(SENSITIVITY_INPUTS)) + shape)
+    dT2, dT4, dw, dq, deta = table
+
+    # Compression: T2(T1, tau, eta_c)
+    dT2_dtau = T1 / eta_c
+    np.divide(T2, T1, out=dT2[iT1, ...])
+    np.multiply(dT2_dtau, dtau_drp, out=dT2[irp, ...])
+    np.multiply(dT2_dtau, dtau_dgamma, out=dT2[igamma, ...])
+    np.divide(T1 - T2, eta_c, out=dT2[ieta_c, ...])
+
+    # Expansion: T4(Tmax, tau, eta_t)
+    dT4_dtau = -T_max * eta_t / tau**2
+    np.divide(T4, T_max, out=dT4[iTmax, ...])
+    np.multiply(dT4_dtau, dtau_drp, out=dT4[irp, ...])
+    np.multiply(dT4_dtau, dtau_dgamma, out=dT4[igamma, ...])
+    np.multiply(-T_max, 1 - 1 / tau, out=dT4[ieta_t, ...])
+
+    # Work & heat
+    np.add(dT4, dT2, out=dw)
+    np.negative(dw, out=dw)
+    dw[iT1, ...] += 1
+    dw[iTmax, ...] += 1
+    dw *= cp
+    np.divide(w_net, cp, out=dw[icp, ...])
+
+    np.negative(dT2, out=dq)
+    dq[iTmax, ...] += 1
+    dq *= cp
+    np.divide(q_in, cp, out=dq[icp, ...])
+
+    # Efficiency (0 with its derivatives wherever no heat is added, as in the kernel)
+    np.multiply(eta, dq, out=deta)
+    np.subtract(dw, deta, out=deta)
+    heat_is_added = np.broadcast_to(q_in != 0, deta.shape)
+    np.divide(deta, q_in, out=deta, where=heat_is_added)
+    np.copyto(deta, 0, where=~heat_is_added)
+    deta[icp, ...] = 0          # eta does not depend on cp; the terms above only cancel to round-off
+
+    point = dict(zip(SENSITIVITY_INPUTS, (T1, pressure_ratio, T_max, eta_c, eta_t, cp, gamma)))
+    return results, CycleJacobian(table, results, point)
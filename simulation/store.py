@@ -0,0 +1,208 @@
+import json
+import operator
+import os
+import re
+
+import numpy as np
+
+from simulation.result_set import ResultSet
+from simulation.sweep import SWEEP_AXES
+from simulation.results import RESULT_FIELDS
+
+# On-disk columnar store for results that do not fit in memory. A store is a directory with
+#   meta.json      column names, chunk size and the committed row count
+#   <column>.f8    one raw little-endian float64 file per column, read through memory maps
+#   stats.f8       per-chunk (min, max) of every column, shape (chunks, columns, 2)
+# Opening reads meta.json and maps the files, so it takes the same time whatever the store size.
+# Rows are appended in any batch size; queries use the chunk statistics to skip chunks that cannot
+# match before touching any column data.
+#
+#   store = ResultStore("sweep.store")
+#   for _, chunk in sweep(space):
+#       store.append(chunk)
+#   good = store.query("eta_actual > 0.4 and w_net > 400e3 and Tmax < 1700")
+#
+# A single writer at a time. meta.json is replaced last on every append, so an interrupted append
+# leaves the store at its previous row count, with chunk statistics that still cover those rows.
+
+DEFAULT_COLUMNS = SWEEP_AXES + RESULT_FIELDS
+DEFAULT_CHUNK_ROWS = 65536
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "=="}
+
+_NAME = r"[A-Za-z_]\w*"
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_OP = r"<=|>=|==|<|>"
+_TERM = re.compile(rf"^\s*(?:(?P<column>{_NAME})\s*(?P<op>{_OP})\s*(?P<value>{_NUMBER})"
+                   rf"|(?P<value_first>{_NUMBER})\s*(?P<op_first>{_OP})\s*(?P<column_first>{_NAME}))\s*$")
+
+def parse_query(where):
+    # "eta_actual > 0.4 and 1500 <= Tmax" → [("eta_actual", ">", 0.4), ("Tmax", ">=", 1500.0)].
+    # Only conjunctions of column-vs-number comparisons are supported. A list of such tuples is
+    # accepted as is.
+    if not isinstance(where, str):
+        return [(column, op, float(value)) for column, op, value in where]
+    terms = []
+    for text in re.split(r"\band\b", where):
+        match = _TERM.match(text)
+        if match is None:
+            raise ValueError(f"Cannot parse query term: '{text.strip()}'")
+        if match["column"] is not None:
+            terms.append((match["column"], match["op"], float(match["value"])))
+        else:
+            terms.append((match["column_first"], FLIPPED[match["op_first"]], float(match["value_first"])))
+    return terms
+
+class ResultStore:
+    # Opens the store at `path`, creating it with `columns` if it does not exist yet
+    def __init__(self, path, columns=DEFAULT_COLUMNS, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.path = str(path)
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as file:
+                meta = json.load(file)
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            meta = {"format": 1, "columns": list(columns), "chunk_rows": int(chunk_rows), "rows": 0}
+            for column in meta["columns"]:
+                open(self._column_path(column), "wb").close()
+            open(self._stats_path(), "wb").close()
+            self._write_meta(meta)
+
+        self.columns = tuple(meta["columns"])
+        self.chunk_rows = meta["chunk_rows"]
+        self.rows = meta["rows"]
+        self._column_index = {column: i for i, column in enumerate(self.columns)}
+        self._views = {}
+        self._stats = None
+
+    def _column_path(self, column):
+        return os.path.join(self.path, f"{column}.f8")
+
+    def _stats_path(self):
+        return os.path.join(self.path, "stats.f8")
+
+    def _write_meta(self, meta):
+        meta_path = os.path.join(self.path, "meta.json")
+        with open(meta_path + ".tmp", "w") as file:
+            json.dump(meta, file)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @property
+    def chunks(self):
+        return -(-self.rows // self.chunk_rows)
+
+    @property
+    def stats(self):
+        # (chunks, columns, 2) array of per-chunk minimum and maximum
+        if self._stats is None:
+            if self.chunks:
+                self._stats = np.memmap(self._stats_path(), dtype="<f8", mode="r",
+                                        shape=(self.chunks, len(self.columns), 2))
+            else:
+                self._stats = np.empty((0, len(self.columns), 2))
+        return self._stats
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, column):
+        # Whole column as a read-only memory map
+        view = self._views.get(column)
+        if view is None:
+            if column not in self._column_index:
+                raise KeyError(column)
+            if self.rows:
+                view = np.memmap(self._column_path(column), dtype="<f8", mode="r", shape=(self.rows,))
+            else:
+                view = np.empty(0)
+            self._views[column] = view
+        return view
+
+    def append(self, columns):
+        # `columns` maps every store column to an array (or scalar, broadcast to the batch length),
+        # e.g. a sweep chunk or a CLI chunk. A ResultSet alone only has the output columns; add its
+        # inputs first for a store with the default columns: dict(inputs, **results)
+        missing = [column for column in self.columns if column not in columns]
+        if missing:
+            raise ValueError(f"Missing column(s) for this store: {', '.join(missing)}")
+        rows = max(np.size(columns[column]) for column in self.columns)
+        if rows == 0:
+            return 0
+        block = np.empty((len(self.columns), rows), dtype="<f8")
+        for i, column in enumerate(self.columns):
+            block[i] = columns[column]
+
+        self._views = {}
+        self._stats = None
+        offset = self.rows * 8
+        for i, column in enumerate(self.columns):
+            with open(self._column_path(column), "r+b") as file:
+                file.truncate(offset)   # drops anything left by an interrupted append
+                file.seek(offset)
+                block[i].tofile(file)
+
+        # Min/max of every chunk the batch touches; the first one may be partially filled already
+        first_chunk = self.rows // self.chunk_rows
+        boundaries = np.arange(first_chunk + 1, -(-(self.rows + rows) // self.chunk_rows)) * self.chunk_rows
+        starts = np.concatenate(([0], boundaries - self.rows))
+        stats = np.stack([np.fmin.reduceat(block, starts, axis=1).T,
+                          np.fmax.reduceat(block, starts, axis=1).T], axis=-1)
+        if self.rows % self.chunk_rows:
+            previous = np.fromfile(self._stats_path(), dtype="<f8", count=len(self.columns) * 2,
+                                   offset=first_chunk * len(self.columns) * 16).reshape(len(self.columns), 2)
+            stats[0, :, 0] = np.fmin(stats[0, :, 0], previous[:, 0])
+            stats[0, :, 1] = np.fmax(stats[0, :, 1], previous[:, 1])
+        # Written in place without truncating: the entry of a partially filled chunk only widens, so
+        # stats.f8 stays valid for the committed rows wherever an interrupted append stops, and
+        # entries past them are overwritten by the next append
+        with open(self._stats_path(), "r+b") as file:
+            file.seek(first_chunk * len(self.columns) * 16)
+            stats.astype("<f8").tofile(file)
+
+        self.rows += rows
+        self._write_meta({"format": 1, "columns": list(self.columns), "chunk_rows": self.chunk_rows,
+                          "rows": self.rows})
+        return rows
+
+    def candidate_chunks(self, where):
+        # Indices of the chunks whose min/max ranges allow a match; NaN-only chunks never match
+        keep = np.ones(self.chunks, dtype=bool)
+        for column, op, value in parse_query(where):
+            if column not in self._column_index:
+                raise KeyError(column)
+            low, high = self.stats[:, self._column_index[column], 0], self.stats[:, self._column_index[column], 1]
+            if op == ">":
+                keep &= high > value
+            elif op == ">=":
+                keep &= high >= value
+            elif op == "<":
+                keep &= low < value
+            elif op == "<=":
+                keep &= low <= value
+            else:
+                keep &= (low <= value) & (high >= value)
+        return np.flatnonzero(keep)
+
+    def query_chunks(self, where, columns=None):
+        # Yields dicts of the matching rows chunk by chunk, reading only candidate chunks
+        terms = parse_query(where)
+        columns = self.columns if columns is None else tuple(columns)
+        for chunk in self.candidate_chunks(terms):
+            start = int(chunk) * self.chunk_rows
+            stop = min(start + self.chunk_rows, self.rows)
+            mask = np.ones(stop - start, dtype=bool)
+            for column, op, value in terms:
+                mask &= OPERATORS[op](self[column][start:stop], value)
+            if mask.any():
+                yield {column: self[column][start:stop][mask] for column in columns}
+
+    def query(self, where, columns=None):
+        # All matching rows as a ResultSet with the requested columns
+        columns = self.columns if columns is None else tuple(columns)
+        parts = list(self.query_chunks(where, columns))
+        if not parts:
+            return ResultSet.empty(0, columns)
+        return ResultSet.from_columns({column: np.concatenate([part[column] for part in parts])
+                                       for column in columns}, columns)
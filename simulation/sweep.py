@@ -0,0 +1,78 @@
+import numpy as np
+
+from simulation import profiling
+from simulation.batch import BraytonCycleBatch
+from simulation.cycle_kernel import RESULT_FIELDS
+from simulation.result_set import ResultSet
+
+SWEEP_AXES = ("T1", "P1", "rp", "Tmax", "eta_c", "eta_t")
+
+# Rough bytes held per grid point while a chunk is evaluated:
+# flat index + unravelled indices + coordinates + result buffers + kernel temporaries, all 8 bytes wide
+BYTES_PER_POINT = 8 * (1 + 2 * len(SWEEP_AXES) + len(RESULT_FIELDS) + 4)
+
+DEFAULT_MAX_MEMORY = 64 * 1024**2   # 64 MiB
+
+class DesignSpace:
+    # Cartesian product of 1D axes for the sweep inputs. The grid is never materialized;
+    # points are generated from flat indices on demand. With a `variant`
+    # (simulation.cycle_variants.CycleVariant) the points are evaluated with that cycle architecture.
+    def __init__(self, T1, P1, rp, Tmax, eta_c=1.0, eta_t=1.0, cp=1005, gamma=1.4, air=None, variant=None):
+        self.axes = {
+            "T1": np.atleast_1d(np.asarray(T1, dtype=float)),
+            "P1": np.atleast_1d(np.asarray(P1, dtype=float)),
+            "rp": np.atleast_1d(np.asarray(rp, dtype=float)),
+            "Tmax": np.atleast_1d(np.asarray(Tmax, dtype=float)),
+            "eta_c": np.atleast_1d(np.asarray(eta_c, dtype=float)),
+            "eta_t": np.atleast_1d(np.asarray(eta_t, dtype=float)),
+        }
+        for name, values in self.axes.items():
+            if values.ndim != 1:
+                raise ValueError(f"Sweep axis '{name}' must be one-dimensional.")
+        self.cp = cp
+        self.gamma = gamma
+        self.air = air
+        self.variant = variant
+        self.shape = tuple(len(self.axes[name]) for name in SWEEP_AXES)
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+    def points(self, start, stop):
+        # Coordinates of flat grid indices [start, stop) in C order over SWEEP_AXES
+        indices = np.unravel_index(np.arange(start, stop), self.shape)
+        return {name: self.axes[name][index] for name, index in zip(SWEEP_AXES, indices)}
+
+    def evaluate(self, start, stop, out=None):
+        # Evaluates flat grid indices [start, stop)
+        chunk = self.points(start, stop)
+        if self.variant is not None:
+            chunk.update(self.variant.run(chunk["T1"], chunk["P1"], chunk["rp"], chunk["Tmax"],
+                                          eta_c=chunk["eta_c"], eta_t=chunk["eta_t"], cp=self.cp,
+                                          gamma=self.gamma, air=self.air, out=out))
+            return chunk
+        cycle = BraytonCycleBatch(chunk["T1"], chunk["P1"], chunk["rp"], chunk["Tmax"],
+                                  cp=self.cp, gamma=self.gamma, eta_c=chunk["eta_c"], eta_t=chunk["eta_t"],
+                                  air=self.air)
+        cycle.run(out=out)
+        chunk.update(cycle.get_results())
+        return chunk
+
+def chunk_size_for(max_memory=DEFAULT_MAX_MEMORY):
+    return max(1, int(max_memory // BYTES_PER_POINT))
+
+def sweep(space, max_memory=DEFAULT_MAX_MEMORY, chunk_size=None):
+    # Walks the whole design space in fixed-size chunks and yields (start, columns) per chunk,
+    # where `start` is the flat grid index of the first point in the chunk.
+    # Result buffers are reused between chunks, so copy anything that has to outlive the next step.
+    if space.size == 0:
+        return
+    if chunk_size is None:
+        chunk_size = chunk_size_for(max_memory)
+    chunk_size = min(chunk_size, space.size)
+
+    buffers = ResultSet.empty(chunk_size)
+    for start in range(0, space.size, chunk_size):
+        stop = min(start + chunk_size, space.size)
+        out = buffers if stop - start == chunk_size else buffers[:stop - start]
+        with profiling.timed("sweep.chunk"):
+            chunk = space.evaluate(start, stop, out=out)
+        yield start, chunk
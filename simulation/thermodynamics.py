@@ -1,27 +1,106 @@
-def compressor_exit_temperature(compressor_inlet_temperature, pressure_ratio, heat_capacity_ratio):
-    temperature = compressor_inlet_temperature * (pressure_ratio)**((heat_capacity_ratio - 1)/heat_capacity_ratio)
-    return temperature
+import numpy as np
 
-def compressor_exit_pressure(compressor_inlet_pressure, pressure_ratio):
-    pressure = compressor_inlet_pressure * pressure_ratio
-    return pressure
+# The cycle relations, as used by brayton_cycle_kernel, BraytonCycle's graph, the cycle variants and
+# the turbofan components.
+# All inputs broadcast against each other and every function accepts an optional
+# preallocated `out` array, so whole-cycle evaluations can run without temporaries.
+# Without `out` the relation is evaluated with plain arithmetic: Python floats give Python floats
+# (BraytonCycle's single points pay no ufunc or array overhead) and arrays give new arrays, with the
+# same operations in the same order, so both paths agree bit for bit.
+# The compressor/turbine relations take the isentropic temperature ratio
+# rp**((gamma - 1)/gamma) instead of the pressure ratio, so it is only computed once per cycle.
 
-def turbine_exit_temperature(turbine_inlet_temperature, pressure_ratio, heat_capacity_ratio):
-    temperature = turbine_inlet_temperature * (1 / pressure_ratio)**((heat_capacity_ratio - 1)/heat_capacity_ratio)
-    return temperature
+def isentropic_temperature_ratio(pressure_ratio, heat_capacity_ratio, out=None):
+    if out is None:
+        return pressure_ratio ** ((heat_capacity_ratio - 1) / heat_capacity_ratio)
+    np.subtract(heat_capacity_ratio, 1, out=out)
+    np.divide(out, heat_capacity_ratio, out=out)
+    np.power(pressure_ratio, out, out=out)
+    return out
 
-def compressor_work(specific_heat, compressor_exit_temperature, compressor_inlet_temperature):
-    work = specific_heat * (compressor_exit_temperature - compressor_inlet_temperature)
-    return work
+def compressor_exit_temperature(compressor_inlet_temperature, temperature_ratio, out=None):
+    if out is None:
+        return compressor_inlet_temperature * temperature_ratio
+    np.multiply(compressor_inlet_temperature, temperature_ratio, out=out)
+    return out
 
-def turbine_work(specific_heat, turbine_inlet_temperature, turbine_exit_temperature):
-    work = specific_heat * (turbine_inlet_temperature - turbine_exit_temperature)
-    return work
+def actual_compressor_exit_temperature(compressor_inlet_temperature, temperature_ratio,
+                                       compressor_efficiency, out=None):
+    # T2 = T1 (1 + (T2s/T1 - 1) / eta_c)
+    if out is None:
+        return compressor_inlet_temperature * ((temperature_ratio - 1) / compressor_efficiency + 1)
+    np.subtract(temperature_ratio, 1, out=out)
+    np.divide(out, compressor_efficiency, out=out)
+    np.add(out, 1, out=out)
+    np.multiply(compressor_inlet_temperature, out, out=out)
+    return out
 
-def heat_added(specific_heat, turbine_inlet_temperature, compressor_exit_temperature):
-    energy = specific_heat * (turbine_inlet_temperature - compressor_exit_temperature)
-    return energy
+def compressor_exit_pressure(compressor_inlet_pressure, pressure_ratio, out=None):
+    if out is None:
+        return compressor_inlet_pressure * pressure_ratio
+    np.multiply(compressor_inlet_pressure, pressure_ratio, out=out)
+    return out
 
-def ideal_efficiency(pressure_ratio, heat_capacity_ratio):
-    efficiency =  1 - (1 / pressure_ratio**((heat_capacity_ratio - 1) / heat_capacity_ratio))
-    return efficiency
+def turbine_exit_temperature(turbine_inlet_temperature, temperature_ratio, out=None):
+    if out is None:
+        return turbine_inlet_temperature / temperature_ratio
+    np.divide(turbine_inlet_temperature, temperature_ratio, out=out)
+    return out
+
+def actual_turbine_exit_temperature(turbine_inlet_temperature, temperature_ratio,
+                                    turbine_efficiency, out=None):
+    # T4 = T3 (1 - eta_t (1 - T4s/T3))
+    if out is None:
+        return turbine_inlet_temperature * (1 - turbine_efficiency * (1 - 1 / temperature_ratio))
+    np.reciprocal(temperature_ratio, out=out)
+    np.subtract(1, out, out=out)
+    np.multiply(turbine_efficiency, out, out=out)
+    np.subtract(1, out, out=out)
+    np.multiply(turbine_inlet_temperature, out, out=out)
+    return out
+
+def compressor_work(specific_heat, compressor_exit_temperature, compressor_inlet_temperature, out=None):
+    if out is None:
+        return specific_heat * (compressor_exit_temperature - compressor_inlet_temperature)
+    np.subtract(compressor_exit_temperature, compressor_inlet_temperature, out=out)
+    np.multiply(specific_heat, out, out=out)
+    return out
+
+def turbine_work(specific_heat, turbine_inlet_temperature, turbine_exit_temperature, out=None):
+    if out is None:
+        return specific_heat * (turbine_inlet_temperature - turbine_exit_temperature)
+    np.subtract(turbine_inlet_temperature, turbine_exit_temperature, out=out)
+    np.multiply(specific_heat, out, out=out)
+    return out
+
+def heat_added(specific_heat, turbine_inlet_temperature, compressor_exit_temperature, out=None):
+    if out is None:
+        return specific_heat * (turbine_inlet_temperature - compressor_exit_temperature)
+    np.subtract(turbine_inlet_temperature, compressor_exit_temperature, out=out)
+    np.multiply(specific_heat, out, out=out)
+    return out
+
+def net_work(turbine_work, compressor_work, out=None):
+    if out is None:
+        return turbine_work - compressor_work
+    np.subtract(turbine_work, compressor_work, out=out)
+    return out
+
+def ideal_efficiency(temperature_ratio, out=None):
+    # `out` may be the temperature ratio buffer itself
+    if out is None:
+        return 1 - 1 / temperature_ratio
+    np.reciprocal(temperature_ratio, out=out)
+    np.subtract(1, out, out=out)
+    return out
+
+def thermal_efficiency(net_work, heat_input, out=None):
+    # 0 wherever no heat is added, as in BraytonCycle
+    if out is None:
+        if isinstance(heat_input, (float, int)) and isinstance(net_work, (float, int)):
+            return net_work / heat_input if heat_input != 0 else 0.0
+        out = np.empty(np.broadcast_shapes(np.shape(net_work), np.shape(heat_input)))
+    heat_is_added = np.not_equal(heat_input, 0)
+    np.divide(net_work, heat_input, out=out, where=heat_is_added)
+    np.copyto(out, 0, where=~heat_is_added)
+    return out
@@ -0,0 +1,179 @@
+import numpy as np
+
+from simulation.thermodynamics import (
+    isentropic_temperature_ratio,
+    actual_compressor_exit_temperature,
+    compressor_exit_pressure,
+    compressor_work,
+    heat_added
+)
+from simulation.mission import compressor_inlet_conditions
+
+# Two-spool separate-flow turbofan as a network of components, with constant cp and gamma:
+#
+#   ambient → inlet → fan ─┬─ bypass (BPR kg per kg of core air) ──────────────────→ bypass nozzle (19)
+#                     (2)  │ (13)
+#                          └─ LPC → HPC → burner → HPT → LPT ──────────────────────→ core nozzle (9)
+#                            (25)   (3)    (4)     (45)   (5)
+#
+# The HPT drives the HPC, the LPT drives the fan and the LPC (the low spool). Every component works
+# on arrays, using the kernel's relations (simulation.thermodynamics), and every parameter may
+# be an array, so a whole batch of engines and flight conditions goes through the network in one pass:
+#
+#   engine = Turbofan(bypass_ratio=np.linspace(0.3, 8, 1000), fan_pressure_ratio=1.6,
+#                     lpc_pressure_ratio=1.5, hpc_pressure_ratio=12, T_max=1600)
+#   results = engine.run(T_ambient=216.65, P_ambient=22632, mach=0.8, mass_flow=100)
+#   results["thrust"], results["tsfc"]
+#   ResultSet.from_columns(results)     # as one contiguous block, e.g. for a ResultStore
+#
+# Stations are total (stagnation) temperatures and pressures. Points where the engine cannot run
+# (turbines unable to drive their compressors, nozzle pressure below ambient) come out as NaN.
+
+TURBOFAN_FIELDS = ("Tt2", "Pt2", "Tt13", "Pt13", "Tt25", "Pt25", "Tt3", "Pt3", "Tt4", "Pt4",
+                   "Tt45", "Pt45", "Tt5", "Pt5", "fuel_air_ratio", "V0", "V9", "V19",
+                   "specific_thrust", "thrust", "tsfc")
+
+class GasState:
+    # Total temperature [K] and pressure [Pa] at a station
+    __slots__ = ("Tt", "Pt")
+
+    def __init__(self, Tt, Pt):
+        self.Tt = Tt
+        self.Pt = Pt
+
+class Compressor:
+    # Fan, LPC (booster) or HPC
+    def __init__(self, pressure_ratio, efficiency, cp, gamma):
+        self.pressure_ratio = pressure_ratio
+        self.efficiency = efficiency
+        self.cp = cp
+        self.gamma = gamma
+
+    def __call__(self, inlet):
+        temperature_ratio = isentropic_temperature_ratio(self.pressure_ratio, self.gamma)
+        return GasState(actual_compressor_exit_temperature(inlet.Tt, temperature_ratio, self.efficiency),
+                        compressor_exit_pressure(inlet.Pt, self.pressure_ratio))
+
+    def work(self, inlet, outlet):
+        # Per kg of air through the compressor
+        return compressor_work(self.cp, outlet.Tt, inlet.Tt)
+
+class Burner:
+    # Heats the core flow to T_max; returns the exit state and the fuel-air ratio
+    def __init__(self, T_max, efficiency, pressure_ratio, fuel_heating_value, cp):
+        self.T_max = T_max
+        self.efficiency = efficiency
+        self.pressure_ratio = pressure_ratio
+        self.fuel_heating_value = fuel_heating_value
+        self.cp = cp
+
+    def __call__(self, inlet):
+        fuel_air_ratio = (heat_added(self.cp, self.T_max, inlet.Tt)
+                          / (self.efficiency * self.fuel_heating_value - self.cp * self.T_max))
+        outlet = GasState(self.T_max, compressor_exit_pressure(inlet.Pt, self.pressure_ratio))
+        return outlet, fuel_air_ratio
+
+class Turbine:
+    # HPT or LPT: expands the core flow (1 + f kg per kg of core air) until it delivers `work` per kg
+    # of core air to its spool through the shaft's mechanical efficiency
+    def __init__(self, efficiency, mechanical_efficiency, cp, gamma):
+        self.efficiency = efficiency
+        self.mechanical_efficiency = mechanical_efficiency
+        self.cp = cp
+        self.gamma = gamma
+
+    def __call__(self, inlet, work, fuel_air_ratio):
+        Tt = inlet.Tt - work / (self.mechanical_efficiency * (1 + fuel_air_ratio) * self.cp)
+        Tt_isentropic = inlet.Tt - (inlet.Tt - Tt) / self.efficiency
+        Pt = inlet.Pt * (Tt_isentropic / inlet.Tt) ** (self.gamma / (self.gamma - 1))
+        return GasState(Tt, Pt)
+
+class Nozzle:
+    # Convergent nozzle: choked (exit at sonic conditions, with pressure thrust) above the critical
+    # pressure ratio, expanded to ambient below it. fully_expanded=True always expands to ambient.
+    def __init__(self, cp, gamma, fully_expanded=False):
+        self.cp = cp
+        self.gamma = gamma
+        self.fully_expanded = fully_expanded
+
+    def __call__(self, inlet, P_ambient):
+        # Exit velocity [m/s] and pressure thrust per kg/s through the nozzle [N·s/kg]
+        exponent = (self.gamma - 1) / self.gamma
+        expanded = inlet.Tt * (P_ambient / inlet.Pt) ** exponent
+        if self.fully_expanded:
+            return np.sqrt(2 * self.cp * (inlet.Tt - expanded)), 0.0
+
+        critical = ((self.gamma + 1) / 2) ** (1 / exponent)          # Pt/P* at Mach 1
+        choked = inlet.Pt / P_ambient > critical
+        T_exit = np.where(choked, inlet.Tt * 2 / (self.gamma + 1), expanded)
+        P_exit = np.where(choked, inlet.Pt / critical, P_ambient)
+        velocity = np.sqrt(2 * self.cp * (inlet.Tt - T_exit))
+        # (P_exit - P_ambient) A / m with A / m = R T_exit / (P_exit V)
+        R = self.cp * exponent
+        pressure_thrust = (P_exit - P_ambient) * R * T_exit / (P_exit * velocity)
+        return velocity, pressure_thrust
+
+class Turbofan:
+    def __init__(self, bypass_ratio, fan_pressure_ratio, lpc_pressure_ratio, hpc_pressure_ratio, T_max,
+                 eta_fan=0.9, eta_lpc=0.9, eta_hpc=0.87, eta_hpt=0.9, eta_lpt=0.9,
+                 burner_efficiency=0.99, burner_pressure_ratio=0.96, mechanical_efficiency=0.99,
+                 fuel_heating_value=43e6, inlet_recovery=None, fully_expanded=False, cp=1005, gamma=1.4):
+        self.bypass_ratio = bypass_ratio                  # Bypass air per kg of core air
+        self.inlet_recovery = inlet_recovery              # Inlet total pressure ratio; None: MIL-E-5008B ram recovery
+        self.cp = cp                                      # Specific heat [J/kg·K]
+        self.gamma = gamma                                # Heat capacity ratio
+        self.fan = Compressor(fan_pressure_ratio, eta_fan, cp, gamma)
+        self.lpc = Compressor(lpc_pressure_ratio, eta_lpc, cp, gamma)
+        self.hpc = Compressor(hpc_pressure_ratio, eta_hpc, cp, gamma)
+        self.burner = Burner(T_max, burner_efficiency, burner_pressure_ratio, fuel_heating_value, cp)
+        self.hpt = Turbine(eta_hpt, mechanical_efficiency, cp, gamma)
+        self.lpt = Turbine(eta_lpt, mechanical_efficiency, cp, gamma)
+        self.core_nozzle = Nozzle(cp, gamma, fully_expanded)
+        self.bypass_nozzle = Nozzle(cp, gamma, fully_expanded)
+
+    @classmethod
+    def from_preset(cls, preset, bypass_ratio, fan_pressure_ratio, lpc_pressure_ratio=1.0, **options):
+        # Engine with a GUI preset's overall pressure ratio (rp = fan × LPC × HPC), T_max and
+        # component efficiencies (eta_c for the compressors, eta_t for the turbines)
+        hpc_pressure_ratio = preset["rp"] / (np.asarray(fan_pressure_ratio) * lpc_pressure_ratio)
+        efficiencies = {"eta_fan": preset["eta_c"], "eta_lpc": preset["eta_c"], "eta_hpc": preset["eta_c"],
+                        "eta_hpt": preset["eta_t"], "eta_lpt": preset["eta_t"]}
+        return cls(bypass_ratio, fan_pressure_ratio, lpc_pressure_ratio, hpc_pressure_ratio, preset["Tmax"],
+                   **dict(efficiencies, **options))
+
+    def run(self, T_ambient, P_ambient, mach=0.0, mass_flow=1.0):
+        # Flight conditions and the total air mass flow [kg/s] broadcast against the engine
+        # parameters. Returns a dict of TURBOFAN_FIELDS arrays, all of the batch shape: station
+        # totals, exit velocities, specific thrust [N·s/kg of total air], thrust [N] and TSFC [kg/(N·s)].
+        # Columns that do not vary over the batch are read-only broadcast views.
+        cp, gamma, bypass_ratio = self.cp, self.gamma, self.bypass_ratio
+        with np.errstate(invalid="ignore", divide="ignore"):
+            inlet = GasState(*compressor_inlet_conditions(T_ambient, P_ambient, mach, gamma, self.inlet_recovery))
+            fan_exit = self.fan(inlet)
+            lpc_exit = self.lpc(fan_exit)
+            hpc_exit = self.hpc(lpc_exit)
+            burner_exit, fuel_air_ratio = self.burner(hpc_exit)
+
+            # Spool balances, per kg of core air: HPT ↔ HPC, LPT ↔ fan (core + bypass flow) + LPC
+            hpt_exit = self.hpt(burner_exit, self.hpc.work(lpc_exit, hpc_exit), fuel_air_ratio)
+            low_spool_work = (1 + bypass_ratio) * self.fan.work(inlet, fan_exit) + self.lpc.work(fan_exit, lpc_exit)
+            lpt_exit = self.lpt(hpt_exit, low_spool_work, fuel_air_ratio)
+
+            V0 = mach * np.sqrt(gamma * cp * (gamma - 1) / gamma * T_ambient)
+            V9, core_pressure_thrust = self.core_nozzle(lpt_exit, P_ambient)
+            V19, bypass_pressure_thrust = self.bypass_nozzle(fan_exit, P_ambient)
+
+            core_thrust = (1 + fuel_air_ratio) * (V9 + core_pressure_thrust) - V0
+            bypass_thrust = bypass_ratio * (V19 + bypass_pressure_thrust - V0)
+            specific_thrust = (core_thrust + bypass_thrust) / (1 + bypass_ratio)
+            tsfc = fuel_air_ratio / ((1 + bypass_ratio) * specific_thrust)
+
+        columns = {"Tt2": inlet.Tt, "Pt2": inlet.Pt, "Tt13": fan_exit.Tt, "Pt13": fan_exit.Pt,
+                   "Tt25": lpc_exit.Tt, "Pt25": lpc_exit.Pt, "Tt3": hpc_exit.Tt, "Pt3": hpc_exit.Pt,
+                   "Tt4": burner_exit.Tt, "Pt4": burner_exit.Pt, "Tt45": hpt_exit.Tt, "Pt45": hpt_exit.Pt,
+                   "Tt5": lpt_exit.Tt, "Pt5": lpt_exit.Pt, "fuel_air_ratio": fuel_air_ratio,
+                   "V0": V0, "V9": V9, "V19": V19, "specific_thrust": specific_thrust,
+                   "thrust": specific_thrust * mass_flow, "tsfc": tsfc}
+        shape = np.broadcast_shapes(*(np.shape(column) for column in columns.values()))
+        return {field: columns[field] if isinstance(columns[field], np.ndarray) and columns[field].shape == shape
+                else np.broadcast_to(columns[field], shape) for field in TURBOFAN_FIELDS}